@@ -1,6 +1,13 @@
 from django.contrib import admin
-from .models import CustomUser
+from .models import CustomUser, ServiceClient
 
 # Register your models here.
 
 admin.site.register(CustomUser)
+
+
+@admin.register(ServiceClient)
+class ServiceClientAdmin(admin.ModelAdmin):
+    # Sekret ustawia komenda create_service_client.
+    list_display = ("client_id", "name", "scopes", "is_active")
+    readonly_fields = ("secret_hash", "created_at")
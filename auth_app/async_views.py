@@ -0,0 +1,162 @@
+"""
+Async implementations of the hot endpoints (login, refresh, check) for ASGI
+deployments. They speak the same request/response format as the DRF views
+but avoid the per-request ``sync_to_async`` thread hop: the database is read
+through the async ORM and password hashing runs on the bounded hashing pool.
+
+Enabled with ``AUTH_ASYNC_VIEWS``.
+"""
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import exceptions
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import AUTH_HEADER_TYPES
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import CachedJWTAuthentication, ClaimsJWTAuthentication
+from .backends import login_candidates, pick_login_user
+from .hashing import acheck_password, amake_password, schedule_rehash
+from .models import CustomUser
+from .revocation import revocations
+from .throttling import IPRateThrottle, UsernameRateThrottle
+from .tokens import RefreshToken, rotate, token_version
+
+NO_ACTIVE_ACCOUNT = _("No active account found with the given credentials")
+NO_ACTIVE_ACCOUNT_FOR_TOKEN = _("No active account found for the given token.")
+REQUIRED = _("This field is required.")
+NOT_A_STRING = _("Not a valid string.")
+TOKEN_REVOKED = _("Token has been revoked")
+PARSERS = [JSONParser(), FormParser(), MultiPartParser()]
+
+
+def _error_response(exc):
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False)
+    if exc.status_code == 401:
+        response["WWW-Authenticate"] = f'{AUTH_HEADER_TYPES[0]} realm="api"'
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+def _parse(request):
+    # Wrap in a DRF request to reuse its parsers and the throttle classes.
+    return Request(request, parsers=PARSERS)
+
+
+def _check_throttles(request, scope):
+    view = SimpleNamespace(throttle_scope=scope)
+    for throttle in (IPRateThrottle(), UsernameRateThrottle()):
+        if not throttle.allow_request(request, view):
+            raise exceptions.Throttled(throttle.wait())
+
+
+def _require(data, *fields):
+    if not isinstance(data, dict):
+        data = {}
+    missing = {field: [REQUIRED] for field in fields if not data.get(field)}
+    if missing:
+        raise exceptions.ValidationError(missing)
+    return [data[field] for field in fields]
+
+
+def _strings(**fields):
+    # Same coercion as DRF's CharField: numbers become strings, anything else is rejected.
+    invalid = {
+        field: [NOT_A_STRING] for field, value in fields.items()
+        if isinstance(value, bool) or not isinstance(value, (str, int, float))
+    }
+    if invalid:
+        raise exceptions.ValidationError(invalid)
+    return [str(value) for value in fields.values()]
+
+
+async def _run_blocking(blocking, func, *args):
+    # The revocation store and the throttles only block on I/O when they are
+    # backed by a shared cache; otherwise they are cheap enough to run inline.
+    if not blocking:
+        return func(*args)
+    return await sync_to_async(func, thread_sensitive=False)(*args)
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    try:
+        request = _parse(request)
+        await _run_blocking(settings.AUTH_THROTTLE_CACHE, _check_throttles, request, "login")
+        username, password = _require(request.data, CustomUser.USERNAME_FIELD, "password")
+
+        username, password = _strings(**{CustomUser.USERNAME_FIELD: username, "password": password})
+        user = pick_login_user([user async for user in login_candidates(username)], username)
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            await amake_password(password)
+            raise exceptions.AuthenticationFailed(NO_ACTIVE_ACCOUNT, "no_active_account")
+
+        if not await acheck_password(password, user.password) or not user.is_active:
+            raise exceptions.AuthenticationFailed(NO_ACTIVE_ACCOUNT, "no_active_account")
+    except exceptions.APIException as exc:
+        return _error_response(exc)
+
+    schedule_rehash(user.pk, password, user.password)
+    refresh = RefreshToken.for_user(user)
+    data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+    if api_settings.UPDATE_LAST_LOGIN:
+        await CustomUser._default_manager.filter(pk=user.pk).aupdate(last_login=timezone.now())
+
+    return JsonResponse(data)
+
+
+@csrf_exempt
+@require_POST
+async def refresh(request):
+    try:
+        (raw_token,) = _require(_parse(request).data, "refresh")
+
+        try:
+            token = await _run_blocking(revocations.cache_alias, RefreshToken, raw_token)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        user = None
+        user_id = token.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = await CustomUser._default_manager.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).afirst()
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise exceptions.AuthenticationFailed(NO_ACTIVE_ACCOUNT_FOR_TOKEN, "no_active_account")
+            if token_version(token) != user.token_version:
+                raise InvalidToken(TOKEN_REVOKED)
+
+        try:
+            data = await _run_blocking(revocations.cache_alias, rotate, token, user)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+    except exceptions.APIException as exc:
+        return _error_response(exc)
+
+    return JsonResponse(data)
+
+
+@require_GET
+async def check_login(request):
+    authentication = ClaimsJWTAuthentication() if settings.AUTH_STATELESS_TOKENS else CachedJWTAuthentication()
+    try:
+        if await authentication.aauthenticate(request) is None:
+            raise exceptions.NotAuthenticated()
+    except exceptions.APIException as exc:
+        return _error_response(exc)
+
+    return JsonResponse({"message": "User is authenticated"})
@@ -0,0 +1,245 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, get_md5_hash_password
+
+from .cache import user_cache
+from .clients import client_tokens
+from .revocation import token_versions
+from .tokens import USER_CLAIMS, AccessToken, ServiceToken, token_version
+
+
+class ClaimsUser:
+    """
+    Lightweight user built from the claims of a verified access token.
+
+    Exposes the fields read by the permission classes without touching the
+    database. Any other attribute (``password``, ``save``, ...) is read from
+    and written to the ``CustomUser`` row, which is loaded on first access.
+    """
+
+    __slots__ = ("id", "role", "is_superuser", "is_active", "token", "_user")
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.id = token[api_settings.USER_ID_CLAIM]
+        self.role = token["role"]
+        self.is_superuser = token["is_superuser"]
+        self.is_active = token["is_active"]
+        self.token = token
+        self._user = None
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not claims.
+        return getattr(self.user, name)
+
+    def __setattr__(self, name, value):
+        if name in ClaimsUser.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.user, name, value)
+
+    def __eq__(self, other):
+        return getattr(other, "pk", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def user(self):
+        """The underlying ``CustomUser`` row, loaded lazily."""
+        if self._user is None:
+            self._user = user_cache.get_user(self.id)
+        return self._user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Database-backed JWT authentication that serves the user row from the
+    in-process ``user_cache`` instead of selecting it on every request.
+    """
+
+    async def aauthenticate(self, request):
+        """Async variant of ``authenticate`` for the async views."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        self.check_version(validated_token, token_versions.current(user_id))
+        user = user_cache.get_user(user_id)
+        return self.check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        self.check_version(validated_token, await token_versions.acurrent(user_id))
+        user = await user_cache.aget_user(user_id)
+        return self.check_user(user, validated_token)
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def check_version(self, validated_token, version):
+        """Reject tokens issued before the user's last "log out everywhere"."""
+        if version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if token_version(validated_token) != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+    def check_user(self, user, validated_token):
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    Authenticates requests from the token claims alone, without a per-request
+    user lookup; only the user's token version is checked, normally from
+    memory. Tokens issued without the user claims fall back to the cached
+    database-backed lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return super().get_user(validated_token)
+        self.check_version(validated_token, token_versions.current(validated_token[api_settings.USER_ID_CLAIM]))
+        return self.get_claims_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        if not self.has_claims(validated_token):
+            return await super().aget_user(validated_token)
+        self.check_version(validated_token, await token_versions.acurrent(validated_token[api_settings.USER_ID_CLAIM]))
+        return self.get_claims_user(validated_token)
+
+    def has_claims(self, validated_token):
+        return api_settings.USER_ID_CLAIM in validated_token and all(
+            claim in validated_token for claim in USER_CLAIMS
+        )
+
+    def get_claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class ServiceClientUser:
+    """A service client authenticated by its client credentials token."""
+
+    is_authenticated = True
+    is_anonymous = False
+    is_superuser = False
+    is_active = True
+    role = None
+
+    def __init__(self, client, token):
+        self.client_id = client.client_id
+        self.scopes = frozenset(token["scope"].split())
+        self.token = token
+
+    def __str__(self):
+        return f"ServiceClientUser {self.client_id}"
+
+
+class ServiceTokenAuthentication(JWTAuthentication):
+    """
+    Authenticates services by a ``ServiceToken`` from the client credentials
+    grant. Other bearer tokens are left to the next authentication class.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        try:
+            token = ServiceToken(raw_token)
+        except TokenError:
+            return None
+
+        # Disabled clients are rejected once their cached row expires.
+        client = client_tokens.get_client(token["client_id"])
+        if client is None:
+            raise AuthenticationFailed(_("Service client not found"), code="client_not_found")
+        return ServiceClientUser(client, token), token
+
+
+@lru_cache(maxsize=settings.AUTH_GATEWAY_TOKEN_CACHE_SIZE)
+def _verified_token(raw_token):
+    # Failures raise and are not cached.
+    return AccessToken(raw_token)
+
+
+@receiver(setting_changed)
+def reset_verified_tokens(setting, **kwargs):
+    if setting in ("AUTH_JWT_KEYS", "SIMPLE_JWT"):
+        _verified_token.cache_clear()
+
+
+class VerifiedTokenCacheMixin:
+    """
+    Remembers the last ``AUTH_GATEWAY_TOKEN_CACHE_SIZE`` verified access
+    tokens. A proxy presents the same token on every request of a session,
+    so only the first call pays for decoding and the signature check; expiry
+    is still checked on every call.
+    """
+
+    def get_validated_token(self, raw_token):
+        try:
+            token = _verified_token(raw_token)
+            token.check_exp(current_time=aware_utcnow())
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        return token
+
+
+class GatewayJWTAuthentication(VerifiedTokenCacheMixin, CachedJWTAuthentication):
+    pass
+
+
+class GatewayClaimsJWTAuthentication(VerifiedTokenCacheMixin, ClaimsJWTAuthentication):
+    pass
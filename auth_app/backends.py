@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from . import hashing
+
+UserModel = get_user_model()
+
+
+def login_candidates(login):
+    """
+    Users whose username or email equals ``login`` ignoring case. Compares
+    ``Lower()`` of both columns, so that each side is served by the functional
+    indexes instead of scanning the table like ``iexact`` would.
+    """
+    value = login.lower()
+    return UserModel._default_manager.alias(
+        username_lower=Lower('username'), email_lower=Lower('email'),
+    ).filter(Q(username_lower=value) | Q(email_lower=value))
+
+
+def pick_login_user(candidates, login):
+    """
+    The account meant by ``login`` among ``login_candidates()``: the exact
+    username first, then the only case-insensitive username match, then the
+    only email match. Ambiguous logins match no one.
+    """
+    for user in candidates:
+        if user.username == login:
+            return user
+    value = login.lower()
+    matches = [user for user in candidates if user.username.lower() == value] \
+        or [user for user in candidates if user.email.lower() == value]
+    return matches[0] if len(matches) == 1 else None
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` that verifies passwords on the bounded hashing pool
+    instead of the request thread. Outdated hashes are upgraded in the
+    background rather than while the login waits. Accepts a username or an
+    email, in any case, as the login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = pick_login_user(list(login_candidates(username)), username)
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            hashing.make_password(password)
+            return None
+
+        if not hashing.check_password(password, user.password) or not self.user_can_authenticate(user):
+            return None
+
+        hashing.schedule_rehash(user.pk, password, user.password)
+        return user
@@ -0,0 +1,119 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from . import metrics
+from .models import CustomUser
+
+
+class UserCache:
+    """
+    Bounded in-process cache of ``CustomUser`` rows keyed by primary key.
+
+    Entries are evicted least-recently-used once ``maxsize`` rows are held and
+    expire ``ttl`` seconds after being loaded. Callers receive a shallow copy,
+    so a view mutating ``request.user`` never leaks into other requests.
+    Invalidation is driven by the ``post_save``/``post_delete`` signals (see
+    ``auth_app.signals``); bulk ``QuerySet.update()`` calls bypass them and are
+    only picked up once the entry expires.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, pk):
+        """Return a copy of the cached row, or ``None`` on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is not None:
+                user, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(pk)
+                    self.hits += 1
+                    return copy.copy(user)
+                del self._entries[pk]
+            self.misses += 1
+        return None
+
+    def set(self, pk, user, generation=None):
+        """
+        Store ``user`` under ``pk``. When ``generation`` is given the row is
+        only stored if nothing was invalidated since it was read, so a save
+        racing with the load cannot leave a stale row behind.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._invalidations:
+                return
+            self._entries[pk] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_user(self, pk):
+        """Return the row for ``pk`` from the cache, loading it on a miss."""
+        user = self.get(pk)
+        if user is not None:
+            return user
+
+        generation = self._invalidations
+        user = CustomUser._default_manager.filter(pk=pk).first()
+        if user is not None:
+            self.set(pk, copy.copy(user), generation)
+        return user
+
+    async def aget_user(self, pk):
+        """Async variant of ``get_user`` using the async ORM on a miss."""
+        user = self.get(pk)
+        if user is not None:
+            return user
+
+        generation = self._invalidations
+        user = await CustomUser._default_manager.filter(pk=pk).afirst()
+        if user is not None:
+            self.set(pk, copy.copy(user), generation)
+        return user
+
+    def invalidate(self, pk):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.pop(pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+def _collect_metrics():
+    stats = user_cache.stats()
+    return {
+        (metrics.USER_CACHE_HITS.name, ()): stats["hits"],
+        (metrics.USER_CACHE_MISSES.name, ()): stats["misses"],
+    }
+
+
+metrics.registry.add_collector(_collect_metrics)
@@ -0,0 +1,147 @@
+"""
+Client credentials grant for services (``POST /auth/token/``).
+
+Client secrets are random 256-bit strings, so unlike passwords they need no
+slow hash: an HMAC-SHA256 keyed with ``SECRET_KEY`` is stored and checked in
+microseconds. Client rows and the tokens issued to them are kept in process,
+and a cached token is handed out again until it gets within
+``AUTH_SERVICE_TOKEN_REFRESH_MARGIN`` seconds of its expiry, so a service
+asking for a token on every call costs one dictionary lookup and one HMAC.
+"""
+import base64
+import binascii
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import ServiceClient
+from .tokens import ServiceToken
+
+KEY_SALT = "auth_app.clients.ServiceClient"
+
+
+class GrantError(Exception):
+    """A failed grant, with its OAuth 2.0 ``error`` code and HTTP status."""
+
+    def __init__(self, error, status=400):
+        super().__init__(error)
+        self.error = error
+        self.status = status
+
+
+def generate_secret():
+    return secrets.token_urlsafe(32)
+
+
+def hash_secret(secret):
+    return salted_hmac(KEY_SALT, secret, algorithm="sha256").hexdigest()
+
+
+def check_secret(secret, secret_hash):
+    return constant_time_compare(hash_secret(secret), secret_hash)
+
+
+class ClientTokenCache:
+    """
+    Service clients by ``client_id`` (for ``AUTH_SERVICE_CLIENT_CACHE_TTL`` seconds)
+    and the last token issued for each client and scope set. Entries of a
+    client are dropped when it is saved or deleted (see ``auth_app.signals``),
+    so a disabled client gets no new tokens; tokens already issued stay valid
+    until they expire.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._tokens = {}
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get_client(self, client_id):
+        """The active client ``client_id``, or ``None``."""
+        now = time.monotonic()
+        entry = self._clients.get(client_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        generation = self._invalidations
+        client = ServiceClient.objects.filter(client_id=client_id, is_active=True).first()
+        # Unknown ids are not remembered, so they cannot fill the cache.
+        if client is not None:
+            with self._lock:
+                if generation == self._invalidations:
+                    self._clients[client_id] = (client, now + settings.AUTH_SERVICE_CLIENT_CACHE_TTL)
+        return client
+
+    def issue(self, client, scopes):
+        """``(encoded token, exp)`` for ``client`` and the frozenset ``scopes``."""
+        key = (client.client_id, scopes)
+        entry = self._tokens.get(key)
+        if entry is not None and entry[1] - time.time() > settings.AUTH_SERVICE_TOKEN_REFRESH_MARGIN:
+            return entry
+
+        token = ServiceToken.for_client(client, scopes)
+        entry = (str(token), token["exp"])
+        with self._lock:
+            self._tokens[key] = entry
+        return entry
+
+    def invalidate(self, client_id):
+        with self._lock:
+            self._invalidations += 1
+            self._clients.pop(client_id, None)
+            for key in [key for key in self._tokens if key[0] == client_id]:
+                del self._tokens[key]
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._clients.clear()
+            self._tokens.clear()
+
+
+client_tokens = ClientTokenCache()
+
+
+def basic_credentials(header):
+    """``(client_id, client_secret)`` from an HTTP Basic ``Authorization`` header, or ``None``."""
+    scheme, _, value = header.partition(" ")
+    if scheme.lower() != "basic":
+        return None
+    try:
+        client_id, sep, client_secret = base64.b64decode(value, validate=True).decode().partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    return (client_id, client_secret) if sep else None
+
+
+def grant_token(client_id, client_secret, scope=None):
+    """
+    Token response for the client credentials grant. ``scope`` (space
+    separated) must be a subset of the client's scopes and defaults to all of
+    them. Raises ``GrantError``.
+    """
+    if not isinstance(client_id, str) or not isinstance(client_secret, str) or not client_id:
+        raise GrantError("invalid_client", 401)
+    client = client_tokens.get_client(client_id)
+    if client is None or not check_secret(client_secret, client.secret_hash):
+        raise GrantError("invalid_client", 401)
+
+    if scope is None:
+        scopes = client.scope_set
+    elif isinstance(scope, str):
+        scopes = frozenset(scope.split())
+    else:
+        raise GrantError("invalid_request")
+    if not scopes <= client.scope_set:
+        raise GrantError("invalid_scope")
+
+    token, exp = client_tokens.issue(client, scopes)
+    return {
+        "access_token": token,
+        "token_type": "Bearer",
+        "expires_in": max(0, int(exp - time.time())),
+        "scope": " ".join(sorted(scopes)),
+    }
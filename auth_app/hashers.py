@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 hasher with the work factor taken from
+    ``AUTH_PBKDF2_ITERATIONS`` (Django's default when unset). Stored hashes
+    with a different iteration count are upgraded on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.AUTH_PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django import db
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import metrics
+from .cache import user_cache
+from .models import CustomUser
+
+
+class HashingPoolSaturated(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many concurrent password operations, please retry shortly.")
+    default_code = "hashing_saturated"
+    wait = 1
+
+
+class HashingPool:
+    """
+    Dedicated threads for password hashing with a bounded queue.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more may
+    wait; anything beyond that is rejected immediately with
+    ``HashingPoolSaturated`` (503) instead of stalling every web worker behind
+    the CPU. hashlib releases the GIL while hashing, so the threads scale
+    across cores.
+    """
+
+    def __init__(self, workers, max_queue):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, wait=False):
+        """
+        Queue ``func(*args)`` on the pool. When it is full, raise
+        ``HashingPoolSaturated``, or with ``wait`` block until a slot frees up.
+        """
+        if not self._slots.acquire(blocking=wait):
+            with self._lock:
+                self.rejected += 1
+            raise HashingPoolSaturated()
+        with self._lock:
+            self.in_flight += 1
+        future = self.executor.submit(self._timed, func, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, func, *args):
+        """Run ``func`` on the pool and wait for the result."""
+        return self.submit(func, *args).result()
+
+    async def arun(self, func, *args):
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.completed += 1
+                self.hash_seconds += elapsed
+            metrics.HASH_SECONDS.observe(elapsed, func.__name__.lstrip("_"))
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "hash_seconds_total": self.hash_seconds,
+                "hash_seconds_avg": self.hash_seconds / self.completed if self.completed else 0.0,
+            }
+
+
+hash_pool = HashingPool(settings.AUTH_HASHING_WORKERS, settings.AUTH_HASHING_QUEUE)
+
+
+def _collect_metrics():
+    stats = hash_pool.stats()
+    return {
+        (metrics.HASHING_REJECTED.name, ()): stats["rejected"],
+        (metrics.HASHING_IN_FLIGHT.name, ()): stats["in_flight"],
+        (metrics.HASHING_QUEUE_DEPTH.name, ()): stats["queue_depth"],
+    }
+
+
+metrics.registry.add_collector(_collect_metrics)
+
+
+def check_password(password, encoded):
+    return hash_pool.run(hashers.check_password, password, encoded)
+
+
+def make_password(password):
+    return hash_pool.run(hashers.make_password, password)
+
+
+def make_passwords(passwords):
+    """
+    Hash a batch of passwords, one pool task per password. At most half of the
+    workers (at least one) hash for the batch at a time and the next hash is
+    only queued when one finishes, so logins queued meanwhile run in between
+    instead of waiting for the whole batch. Waits for free slots rather than
+    failing with ``HashingPoolSaturated``.
+    """
+    window = max(1, hash_pool.workers // 2)
+    encoded, pending = [], deque()
+    for password in passwords:
+        if len(pending) >= window:
+            encoded.append(pending.popleft().result())
+        pending.append(hash_pool.submit(hashers.make_password, password, wait=True))
+    encoded.extend(future.result() for future in pending)
+    return encoded
+
+
+async def acheck_password(password, encoded):
+    return await hash_pool.arun(hashers.check_password, password, encoded)
+
+
+async def amake_password(password):
+    return await hash_pool.arun(hashers.make_password, password)
+
+
+def needs_rehash(encoded):
+    """Whether ``encoded`` was made by another hasher or with another work factor."""
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = hashers.get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def _rehash(user_pk, password, encoded):
+    try:
+        # Only replace the hash that was verified, never a concurrent change.
+        updated = CustomUser._default_manager.filter(pk=user_pk, password=encoded).update(
+            password=hashers.make_password(password)
+        )
+        if updated:
+            user_cache.invalidate(user_pk)
+    finally:
+        db.close_old_connections()
+
+
+def schedule_rehash(user_pk, password, encoded):
+    """
+    Rehash a just-verified password with the current hasher settings on the
+    hashing pool, without making the login wait for it. Skipped when the pool
+    is saturated; the next login tries again.
+    """
+    if not needs_rehash(encoded):
+        return None
+    try:
+        return hash_pool.submit(_rehash, user_pk, password, encoded)
+    except HashingPoolSaturated:
+        return None
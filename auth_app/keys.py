@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from jwt import InvalidAlgorithmError, InvalidTokenError
+from jwt.api_jws import PyJWS
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA"}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Optional[Any] = None
+
+    def to_jwk(self):
+        jwk = PyJWS().get_algorithm_by_name(self.algorithm).to_jwk(self.public_key, as_dict=True)
+        jwk.update(kid=self.kid, alg=self.algorithm, use="sig")
+        return jwk
+
+
+def _read_pem(entry, name):
+    if entry.get(name):
+        return entry[name].encode()
+    if entry.get(f"{name}_file"):
+        return Path(entry[f"{name}_file"]).read_bytes()
+    return None
+
+
+def load_signing_key(entry):
+    """Build a ``SigningKey`` from one ``AUTH_JWT_KEYS`` entry."""
+    from cryptography.hazmat.primitives import serialization
+
+    kid, algorithm = entry.get("kid"), entry.get("algorithm", "RS256")
+    if not kid:
+        raise ImproperlyConfigured("Every AUTH_JWT_KEYS entry needs a 'kid'.")
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ImproperlyConfigured(f"AUTH_JWT_KEYS: unsupported algorithm '{algorithm}' for key '{kid}'.")
+
+    private_pem = _read_pem(entry, "private_key")
+    public_pem = _read_pem(entry, "public_key")
+    private_key = serialization.load_pem_private_key(private_pem, password=None) if private_pem else None
+    if public_pem:
+        public_key = serialization.load_pem_public_key(public_pem)
+    elif private_key is not None:
+        public_key = private_key.public_key()
+    else:
+        raise ImproperlyConfigured(f"AUTH_JWT_KEYS: key '{kid}' has neither a private nor a public key.")
+    return SigningKey(kid, algorithm, public_key, private_key)
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    Token backend backed by a ring of asymmetric keys.
+
+    Tokens are signed with the active key and carry its ``kid`` header;
+    verification picks the key named by the header, so tokens signed with a
+    retired key stay valid for as long as that key remains in the ring.
+    """
+
+    def __init__(self, keys, audience=None, issuer=None, leeway=None, json_encoder=None):
+        signing_keys = [key for key in keys if key.private_key is not None]
+        if not signing_keys:
+            raise ImproperlyConfigured("AUTH_JWT_KEYS needs at least one key with a private key.")
+        self.active_key = signing_keys[0]
+        self.keys = {key.kid: key for key in keys}
+        super().__init__(
+            self.active_key.algorithm,
+            self.active_key.private_key,
+            self.active_key.public_key,
+            audience,
+            issuer,
+            None,
+            leeway,
+            json_encoder,
+        )
+
+    def _validate_algorithm(self, algorithm):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise TokenBackendError(_("Unrecognized algorithm type '{}'").format(algorithm))
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.active_key.private_key,
+            algorithm=self.active_key.algorithm,
+            headers={"kid": self.active_key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        try:
+            key = self.keys.get(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                raise TokenBackendError(_("Token is invalid or expired"))
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except InvalidAlgorithmError as ex:
+            raise TokenBackendError(_("Invalid algorithm specified")) from ex
+        except InvalidTokenError as ex:
+            raise TokenBackendError(_("Token is invalid or expired")) from ex
+
+    def jwks(self):
+        return {"keys": [key.to_jwk() for key in self.keys.values()]}
+
+
+@lru_cache(maxsize=None)
+def get_token_backend():
+    """
+    Return the backend used to sign and verify tokens: a ``KeyRingTokenBackend``
+    when ``AUTH_JWT_KEYS`` is configured, simplejwt's HS256 backend otherwise.
+    """
+    if not settings.AUTH_JWT_KEYS:
+        from rest_framework_simplejwt.state import token_backend
+
+        return token_backend
+
+    return KeyRingTokenBackend(
+        [load_signing_key(entry) for entry in settings.AUTH_JWT_KEYS],
+        api_settings.AUDIENCE,
+        api_settings.ISSUER,
+        api_settings.LEEWAY,
+        api_settings.JSON_ENCODER,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_jwks():
+    backend = get_token_backend()
+    return backend.jwks() if isinstance(backend, KeyRingTokenBackend) else {"keys": []}
+
+
+@receiver(setting_changed)
+def reset_token_backend(setting, **kwargs):
+    if setting in ("AUTH_JWT_KEYS", "SIMPLE_JWT"):
+        get_token_backend.cache_clear()
+        get_jwks.cache_clear()
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, so that nothing is imported yet. Prints the
+# time at the end of each boot phase, then the first and second request.
+PROBE = r"""
+import json, sys, time
+
+start = time.perf_counter()
+phases = []
+
+def mark(name):
+    phases.append((name, time.perf_counter() - start))
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+mark("settings")
+django.setup()
+mark("apps")
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+mark("middleware")
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark("urls")
+from django.test import RequestFactory
+factory = RequestFactory(HTTP_HOST="localhost")
+status = handler.get_response(factory.get(sys.argv[1])).status_code
+mark("first request")
+handler.get_response(factory.get(sys.argv[1]))
+mark("second request")
+print(json.dumps({"phases": phases, "status": status}))
+"""
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold start of a worker in fresh interpreters: time spent on "
+        "settings, app loading, middleware, URLconf and the first request, and "
+        "which packages and modules the imports spend it on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/auth/check/", help="Path of the probed request (default /auth/check/).")
+        parser.add_argument("--api-only", action="store_true", help="Boot with AUTH_API_ONLY=True.")
+        parser.add_argument("--repeat", type=int, default=3, help="Boots timed; the fastest is reported (default 3).")
+        parser.add_argument("--top", type=int, default=15, help="Packages and modules listed (default 15).")
+
+    def handle(self, *args, path, api_only, repeat, top, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "tsk_auth_service.settings"))
+        if api_only:
+            env["AUTH_API_ONLY"] = "True"
+
+        runs = [json.loads(self.probe([], path, env).stdout.splitlines()[-1]) for _ in range(max(1, repeat))]
+        best = min(runs, key=lambda run: run["phases"][-1][1])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Boot phases ({'API-only' if api_only else 'configured'} mode, best of {len(runs)}, "
+            f"GET {path} -> {best['status']})"
+        ))
+        previous = 0.0
+        for name, elapsed in best["phases"]:
+            self.stdout.write(f"  {name:<16} {(elapsed - previous) * 1000:8.1f} ms  (at {elapsed * 1000:.1f} ms)")
+            previous = elapsed
+
+        modules = []
+        for line in self.probe(["-X", "importtime"], path, env).stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                modules.append((match[4], int(match[1]), int(match[2])))
+        packages = Counter()
+        for name, self_us, _ in modules:
+            packages[name.split(".")[0]] += self_us
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Import time by package ({len(modules)} modules, {sum(packages.values()) / 1000:.1f} ms; "
+            f"inflated by -X importtime)"
+        ))
+        for package, self_us in packages.most_common(top):
+            self.stdout.write(f"  {package:<32} {self_us / 1000:8.1f} ms")
+        self.stdout.write(self.style.MIGRATE_HEADING("Slowest imports, including what they import"))
+        for name, _, cumulative_us in sorted(modules, key=lambda module: -module[2])[:top]:
+            self.stdout.write(f"  {name:<48} {cumulative_us / 1000:8.1f} ms")
+
+    def probe(self, options, path, env):
+        result = subprocess.run(
+            [sys.executable, *options, "-c", PROBE, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Boot probe failed:\n{result.stderr[-2000:]}")
+        return result
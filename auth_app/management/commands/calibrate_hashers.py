@@ -0,0 +1,83 @@
+import math
+import os
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+PASSWORD = "calibration-password-123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every configured password hasher on this host and recommend "
+        "a work factor that meets the target hash latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms", type=float, default=250.0,
+            help="Target p50 latency of one password hash, in milliseconds (default 250).",
+        )
+        parser.add_argument(
+            "--samples", type=int, default=20,
+            help="Hashes timed per hasher (default 20).",
+        )
+
+    def handle(self, *args, **options):
+        target = options["target_ms"] / 1000
+        cores = os.cpu_count() or 1
+        self.stdout.write(f"Target latency {options['target_ms']:.0f} ms, {cores} cores\n")
+
+        for hasher in get_hashers():
+            name = type(hasher).__name__
+            try:
+                timings = self.benchmark(hasher, options["samples"])
+            except ValueError as e:
+                # Optional hashers (argon2, bcrypt) without their library.
+                self.stdout.write(self.style.WARNING(f"{name}: skipped ({e})"))
+                continue
+
+            p50 = statistics.median(timings)
+            p99 = statistics.quantiles(timings, n=100, method="inclusive")[98] if len(timings) > 1 else p50
+            per_core = 1 / statistics.fmean(timings)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f"  p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms")
+            self.stdout.write(
+                f"  logins/s: {per_core:.1f} per core, {per_core * cores:.1f} per host"
+            )
+            recommendation = self.recommend(hasher, p50, target)
+            if recommendation:
+                self.stdout.write(self.style.SUCCESS(f"  recommended: {recommendation}"))
+
+    def benchmark(self, hasher, samples):
+        if hasher.library is not None:
+            hasher._load_library()
+        hasher.encode(PASSWORD, hasher.salt())  # warm up
+
+        timings = []
+        for _ in range(samples):
+            salt = hasher.salt()
+            start = time.perf_counter()
+            hasher.encode(PASSWORD, salt)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def recommend(self, hasher, p50, target):
+        """Scale the hasher's work factor so that p50 lands on ``target``."""
+        scale = target / p50
+        if hasattr(hasher, "iterations"):
+            iterations = max(1000, int(round(hasher.iterations * scale, -3)))
+            setting = " (AUTH_PBKDF2_ITERATIONS)" if hasher.algorithm == "pbkdf2_sha256" else ""
+            return f"iterations={iterations}{setting}"
+        if hasattr(hasher, "rounds"):
+            # bcrypt cost is logarithmic.
+            return f"rounds={max(4, hasher.rounds + round(math.log2(scale)))}"
+        if hasattr(hasher, "time_cost"):
+            return f"time_cost={max(1, round(hasher.time_cost * scale))}"
+        if hasattr(hasher, "work_factor"):
+            # scrypt's N must stay a power of two.
+            return f"work_factor={2 ** max(1, round(math.log2(hasher.work_factor * scale)))}"
+        return None
@@ -0,0 +1,44 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.clients import generate_secret, hash_secret
+from auth_app.models import ServiceClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Register a service for the client credentials grant (POST /auth/token/), "
+        "or give an existing one a new secret. The secret is printed only once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("client_id", help="Identifier the service authenticates with.")
+        parser.add_argument("--name", default="", help="Human readable name.")
+        parser.add_argument("--scopes", default="", help='Space separated scopes, e.g. "calendar.read email.send".')
+        parser.add_argument(
+            "--rotate-secret", action="store_true",
+            help="Replace the secret of an existing client; its --name and --scopes are updated when given.",
+        )
+
+    def handle(self, *args, client_id, name, scopes, rotate_secret, **options):
+        secret = generate_secret()
+        client = ServiceClient.objects.filter(client_id=client_id).first()
+        if client is None:
+            client = ServiceClient(client_id=client_id)
+        elif not rotate_secret:
+            raise CommandError(f"Client {client_id!r} already exists; pass --rotate-secret to replace its secret.")
+
+        client.secret_hash = hash_secret(secret)
+        if name or client._state.adding:
+            client.name = name
+        if scopes or client._state.adding:
+            client.scopes = " ".join(sorted(set(scopes.split())))
+        try:
+            client.full_clean()
+        except ValidationError as e:
+            raise CommandError("; ".join(f"{field}: {' '.join(errors)}" for field, errors in e.message_dict.items()))
+        client.save()
+
+        self.stdout.write(f"client_id: {client.client_id}")
+        self.stdout.write(f"client_secret: {secret}")
+        self.stdout.write(f"scopes: {client.scopes or '-'}")
@@ -0,0 +1,172 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.provisioning import build_user, clean_row, find_conflicts, hash_passwords, insert_users
+
+
+def _setup_worker():
+    # Needed when worker processes are spawned rather than forked.
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream users from a CSV or JSONL file (username, email, password or "
+        "password_hash, optional role) into the database in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row, or JSONL file.")
+        parser.add_argument(
+            "--format", choices=["csv", "jsonl"],
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=2000,
+            help="Rows validated and inserted per transaction (default 2000).",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Processes hashing raw passwords (default: one per core; 1 hashes on a single thread).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File recording the last imported line; an existing checkpoint is resumed from.",
+        )
+
+    def handle(self, *args, **options):
+        path, checkpoint = options["path"], options["checkpoint"]
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        self.workers = max(1, options["workers"])
+        self.checkpoint = checkpoint
+        self.created = self.skipped = 0
+
+        resume_after = self.read_checkpoint(checkpoint)
+        if resume_after:
+            self.stdout.write(f"Resuming after line {resume_after}")
+
+        start = time.perf_counter()
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers, initializer=_setup_worker)
+        else:
+            # hashlib releases the GIL, so one thread still overlaps with the inserts.
+            executor = ThreadPoolExecutor(1)
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                records = (r for r in self.read_records(f, fmt) if r[0] > resume_after)
+                # Hash the next chunk on the pool while the current one is inserted.
+                pending = None
+                while chunk := list(islice(records, options["chunk_size"])):
+                    prepared = self.prepare(chunk, executor)
+                    if pending:
+                        self.write(*pending)
+                    pending = prepared
+                if pending:
+                    self.write(*pending)
+        except OSError as e:
+            raise CommandError(e)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - start
+        total = self.created + self.skipped
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.created} users, skipped {self.skipped} rows "
+            f"in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
+
+    def read_records(self, f, fmt):
+        """Yield ``(line, record)`` pairs without loading the file into memory."""
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+            return
+
+        for line, text in enumerate(f, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                record = {"_error": f"Invalid JSON: {e}"}
+            yield line, record if isinstance(record, dict) else {"_error": "Expected a JSON object."}
+
+    def prepare(self, chunk, executor):
+        """Validate a chunk and start hashing its raw passwords."""
+        rows, lines = [], []
+        for line, record in chunk:
+            if "_error" in record:
+                self.reject(line, record, {"non_field_errors": [record["_error"]]})
+                continue
+            row, errors = clean_row(record)
+            if errors:
+                self.reject(line, record, errors)
+                continue
+            rows.append(row)
+            lines.append(line)
+
+        # Drop known duplicates before spending a hash on them.
+        conflicts = find_conflicts(rows)
+        for index, errors in conflicts.items():
+            self.reject(lines[index], rows[index], errors)
+        rows = [row for index, row in enumerate(rows) if index not in conflicts]
+        lines = [line for index, line in enumerate(lines) if index not in conflicts]
+
+        passwords = [row["password"] for row in rows if not row["password_hash"]]
+        size = -(-len(passwords) // self.workers) or 1
+        hashes = [
+            executor.submit(hash_passwords, passwords[i:i + size])
+            for i in range(0, len(passwords), size)
+        ]
+        return rows, lines, hashes, chunk[-1][0]
+
+    def write(self, rows, lines, hashes, last_line):
+        """Insert a prepared chunk and move the checkpoint past it."""
+        hashed = (encoded for future in hashes for encoded in future.result())
+        for row in rows:
+            if not row["password_hash"]:
+                row["password_hash"] = next(hashed)
+
+        # Checked again, the previous chunk was only inserted since prepare().
+        conflicts = find_conflicts(rows)
+        for index, errors in conflicts.items():
+            self.reject(lines[index], rows[index], errors)
+
+        accepted = [index for index in range(len(rows)) if index not in conflicts]
+        failed = insert_users([build_user(rows[index]) for index in accepted])
+        for position, error in failed.items():
+            index = accepted[position]
+            self.reject(lines[index], rows[index], {"non_field_errors": [error]})
+
+        self.created += len(accepted) - len(failed)
+        self.write_checkpoint(last_line)
+
+    def reject(self, line, record, errors):
+        self.skipped += 1
+        messages = "; ".join(f"{field}: {' '.join(map(str, msgs))}" for field, msgs in errors.items())
+        self.stderr.write(f"line {line} ({record.get('username') or '-'}): {messages}")
+
+    def read_checkpoint(self, checkpoint):
+        if not checkpoint or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as f:
+            try:
+                return int(f.read().strip() or 0)
+            except ValueError:
+                raise CommandError(f"Invalid checkpoint file: {checkpoint}")
+
+    def write_checkpoint(self, line):
+        if not self.checkpoint:
+            return
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, "w") as f:
+            f.write(str(line))
+        os.replace(tmp, self.checkpoint)
@@ -0,0 +1,325 @@
+"""
+Minimal metrics registry exported in the Prometheus text format.
+
+Recording is lock-free on the hot path: every thread writes to its own shard
+and shards are only summed when metrics are collected. Each worker process
+periodically writes its totals to ``AUTH_METRICS_DIR`` (one file per process),
+and the metrics endpoint merges all files so that a scrape of any worker sees
+the whole deployment. Without ``AUTH_METRICS_DIR`` a scrape only reports the
+process that answered it.
+
+Counters of exited processes are folded into one archive file, so totals
+never go backwards and files don't pile up. Gauges only count from
+snapshots of live processes written within ``STALE_FLUSHES`` flush
+intervals. Liveness is checked by pid, so the directory must not be shared
+between hosts.
+"""
+import atexit
+import fcntl
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+STALE_FLUSHES = 3
+ARCHIVE = "metrics-archive.json"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def inc(self, *labels, amount=1):
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Gauge(Counter):
+    """
+    Current value of a process-wide quantity, reported by a collector (see
+    ``Registry.add_collector``). Merged snapshots add the processes up.
+    """
+    type = "gauge"
+
+
+class Histogram(Counter):
+    type = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value, *labels):
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        counts = shard.get(key)
+        if counts is None:
+            # One count per bucket plus +Inf, then the sum.
+            counts = shard[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def time(self, *labels):
+        return _Timer(self, labels)
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._snapshot_pid = None
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector):
+        """``collector()`` returns ``{(name, labels): value}`` of process-wide counters, read at collection."""
+        self.collectors.append(collector)
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards[threading.current_thread()] = shard
+            return shard
+
+    def collect(self):
+        """Sum the shards of this process into ``{(name, labels): value}``."""
+        with self._lock:
+            # Fold the shards of finished threads away, so they don't pile up.
+            for thread in [thread for thread in self._shards if not thread.is_alive()]:
+                _merge(self._retired, self._shards.pop(thread))
+            totals = _merge({}, self._retired)
+            for shard in self._shards.values():
+                _merge(totals, dict(shard))
+        for collector in self.collectors:
+            _merge(totals, collector())
+        return totals
+
+    def snapshot_path(self):
+        pid = os.getpid()
+        if self._snapshot_pid != pid:
+            # A new name per process (also after a fork), so a reused pid
+            # never overwrites the counters of an exited process.
+            self._snapshot_pid, self._snapshot_id = pid, uuid.uuid4().hex[:8]
+        return os.path.join(settings.AUTH_METRICS_DIR, f"metrics-{pid}-{self._snapshot_id}.json")
+
+    def flush(self):
+        """Write this process's totals to ``AUTH_METRICS_DIR``."""
+        self._last_flush = time.monotonic()
+        if not settings.AUTH_METRICS_DIR:
+            return
+        _dump(self.collect(), self.snapshot_path())
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= settings.AUTH_METRICS_FLUSH_SECONDS:
+            self.flush()
+
+    def collect_all(self):
+        """Totals of every process that wrote to ``AUTH_METRICS_DIR``, or of this one."""
+        if not settings.AUTH_METRICS_DIR:
+            return self.collect()
+        self.flush()
+        directory = settings.AUTH_METRICS_DIR
+        fresh_since = time.time() - STALE_FLUSHES * settings.AUTH_METRICS_FLUSH_SECONDS
+        totals, dead = {}, []
+        for entry in os.scandir(directory):
+            pid = _snapshot_pid(entry.name)
+            if pid is None:
+                continue
+            if not _is_alive(pid):
+                dead.append(entry.path)
+                continue
+            try:
+                fresh = entry.stat().st_mtime >= fresh_since
+                data = _load(entry.path)
+            except (OSError, ValueError):
+                continue
+            _merge(totals, {key: value for key, value in data.items() if fresh or not self._is_gauge(key)})
+
+        archive_path = os.path.join(directory, ARCHIVE)
+        with open(os.path.join(directory, "metrics.lock"), "w") as lock:
+            # One worker folds at a time, so no snapshot is counted twice.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                archive = _load(archive_path)
+            except (OSError, ValueError):
+                archive = {}
+            for path in dead:
+                try:
+                    data = _load(path)
+                except (OSError, ValueError):
+                    # Folded by another worker in the meantime.
+                    continue
+                _merge(archive, {key: value for key, value in data.items() if not self._is_gauge(key)})
+                _dump(archive, archive_path)
+                os.remove(path)
+        return _merge(totals, archive)
+
+    def _is_gauge(self, key):
+        metric = self.metrics.get(key[0])
+        return metric is not None and metric.type == "gauge"
+
+    def render(self, totals):
+        """Prometheus text exposition format."""
+        lines = []
+        by_name = {}
+        for (name, labels), value in totals.items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        for name, samples in sorted(by_name.items()):
+            metric = self.metrics.get(name)
+            if metric is None:
+                continue
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for labels, value in sorted(samples):
+                pairs = list(zip(metric.labelnames, labels))
+                if metric.type != "histogram":
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*metric.buckets, math.inf), value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(pairs)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _snapshot_pid(filename):
+    """Pid of the process that wrote ``metrics-<pid>-<id>.json``, or ``None``."""
+    if not (filename.startswith("metrics-") and filename.endswith(".json")):
+        return None
+    try:
+        return int(filename[len("metrics-"):-len(".json")].split("-")[0])
+    except ValueError:
+        return None
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _load(path):
+    with open(path) as f:
+        return {(name, tuple(labels)): value for name, labels, value in json.load(f)}
+
+
+def _dump(totals, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump([[name, list(labels), value] for (name, labels), value in totals.items()], f)
+    os.replace(tmp, path)
+
+
+def _merge(totals, values):
+    for key, value in values.items():
+        current = totals.get(key)
+        if current is None:
+            totals[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            totals[key] = [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = current + value
+    return totals
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+REQUEST_SECONDS = registry.histogram(
+    "auth_http_request_duration_seconds", "Time spent handling a request.", ("route", "method", "status"),
+)
+DB_QUERIES = registry.histogram(
+    "auth_db_queries_per_request", "Database queries run by a request.", ("route",), buckets=COUNT_BUCKETS,
+)
+DB_SECONDS = registry.counter(
+    "auth_db_query_seconds_total", "Time spent in database queries.", ("route",),
+)
+HASH_SECONDS = registry.histogram(
+    "auth_password_hash_seconds", "Time spent hashing passwords on the hashing pool.", ("operation",),
+)
+TOKEN_SIGN_SECONDS = registry.histogram(
+    "auth_token_sign_seconds", "Time spent encoding and signing tokens.", ("token_type",),
+)
+TOKEN_VERIFY_SECONDS = registry.histogram(
+    "auth_token_verify_seconds", "Time spent decoding and verifying tokens.", ("token_type",),
+)
+USER_CACHE_HITS = registry.counter("auth_user_cache_hits_total", "User cache lookups served from memory.")
+USER_CACHE_MISSES = registry.counter("auth_user_cache_misses_total", "User cache lookups that hit the database.")
+HASHING_REJECTED = registry.counter(
+    "auth_hashing_rejected_total", "Password operations rejected because the hashing pool was full.",
+)
+HASHING_IN_FLIGHT = registry.gauge(
+    "auth_hashing_in_flight", "Password operations running or waiting on the hashing pool.",
+)
+HASHING_QUEUE_DEPTH = registry.gauge(
+    "auth_hashing_queue_depth", "Password operations waiting for a free hashing thread.",
+)
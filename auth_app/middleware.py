@@ -0,0 +1,151 @@
+"""
+Project middleware: request metrics, read replica pinning, and session,
+CSRF, authentication and messages middleware that step aside for the
+token-authenticated API routes (``AUTH_API_PATH_PREFIXES``). Those views
+authenticate from the ``Authorization`` header and are CSRF exempt, so the
+session lookup, CSRF cookie handling, lazy ``request.user`` and message
+storage are pure overhead there. Everything else, e.g. ``/admin/``, gets
+the stock behaviour.
+
+The lean variants are enabled with ``AUTH_LEAN_API_MIDDLEWARE``, the metrics
+with ``AUTH_METRICS``. ``ReplicaPinMiddleware`` is added when read replicas
+are configured.
+"""
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.db import connections
+from django.middleware import csrf
+
+from . import metrics, routers
+
+
+def is_api_request(request):
+    return request.path_info.startswith(settings.AUTH_API_PATH_PREFIXES)
+
+
+class APIBypassMixin:
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(APIBypassMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(APIBypassMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # process_view hooks are run by the handler, not from __call__.
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(APIBypassMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(APIBypassMixin, messages.MessageMiddleware):
+    pass
+
+
+class QueryTimer:
+    """``execute_wrapper`` counting and timing the queries of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, status and database usage of every request by
+    route. Goes first in ``MIDDLEWARE`` so that it times the whole stack.
+    Queries run by async views happen on other threads and are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        queries = QueryTimer()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, None)
+        return response
+
+    def record(self, request, response, elapsed, queries):
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        metrics.REQUEST_SECONDS.observe(elapsed, route, request.method, str(response.status_code))
+        if queries is not None:
+            metrics.DB_QUERIES.observe(queries.count, route)
+            metrics.DB_SECONDS.inc(route, amount=queries.seconds)
+        metrics.registry.maybe_flush()
+
+
+class ReplicaPinMiddleware:
+    """
+    Runs each request in its own replica routing scope and keeps the client
+    on the primary for a while after it wrote, see ``auth_app.routers``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routers.request_scope(pinned=routers.PIN_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+            self.process_response(response)
+        return response
+
+    async def __acall__(self, request):
+        with routers.request_scope(pinned=routers.PIN_COOKIE in request.COOKIES):
+            response = await self.get_response(request)
+            self.process_response(response)
+        return response
+
+    def process_response(self, response):
+        # Only a write starts the pin, so following reads don't prolong it.
+        # The cookie merely sends reads to the primary; nothing to forge.
+        if routers.wrote():
+            response.set_cookie(
+                routers.PIN_COOKIE, "1", max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite="Lax",
+            )
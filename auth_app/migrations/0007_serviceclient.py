@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0006_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceClient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_id', models.SlugField(max_length=100, unique=True)),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('secret_hash', models.CharField(max_length=64)),
+                ('scopes', models.CharField(blank=True, max_length=1000)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
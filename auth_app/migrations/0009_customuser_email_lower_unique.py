@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:32
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_app', '0008_customuser_token_version_not_editable'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='customuser_email_lower_unique'),
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='customuser_email_lower',
+        ),
+    ]
@@ -1,8 +1,44 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class CustomUser(AbstractUser):
     email = models.EmailField(unique=True)  # Wymagany unikalny e-mail
     role = models.CharField(max_length=100, default='user')
+    # Zwiększenie unieważnia wszystkie tokeny użytkownika (claim "ver").
+    # Poza formularzami, żeby zapis starego formularza nie cofnął wersji.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     # Dodaj dodatkowe pola w razie potrzeby
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Logowanie nazwą użytkownika lub e-mailem bez względu na wielkość liter.
+            models.Index(Lower('username'), name='customuser_username_lower'),
+        ]
+        constraints = [
+            # E-mail jest unikalny bez względu na wielkość liter, inaczej
+            # logowanie e-mailem byłoby niejednoznaczne; indeks służy też logowaniu.
+            models.UniqueConstraint(Lower('email'), name='customuser_email_lower_unique'),
+        ]
+
+
+class ServiceClient(models.Model):
+    """
+    Service registered for the client credentials grant (``/auth/token/``).
+    Only a keyed HMAC of the secret is stored, see ``auth_app.clients``.
+    """
+    client_id = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=200, blank=True)
+    secret_hash = models.CharField(max_length=64)
+    # Zakresy oddzielone spacjami, np. "calendar.read email.send".
+    scopes = models.CharField(max_length=1000, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.client_id
+
+    @property
+    def scope_set(self):
+        return frozenset(self.scopes.split())
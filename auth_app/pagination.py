@@ -0,0 +1,14 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ProfileCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the profile list: each page is a ``WHERE key > last
+    ORDER BY key LIMIT n`` range scan on an indexed column, so deep pages cost
+    the same as the first one. The cursors in ``next``/``previous`` are opaque.
+    """
+    ordering = 'id'
+    page_size = settings.AUTH_PROFILE_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.AUTH_PROFILE_MAX_PAGE_SIZE
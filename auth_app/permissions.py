@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .roles import has_permissions
+
 
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -16,6 +18,35 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return request.user.is_superuser or obj.id == request.user.id
 
 
-class IsAuthenticatedAndHasSpecialRole(permissions.BasePermission):
+class HasPermissions(permissions.BasePermission):
+    """
+    Allows authenticated users whose role grants every permission in
+    ``required``, with a bitmask check against the compiled role table.
+    """
+    required = ()
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user and request.user.is_authenticated
+            and has_permissions(request.user, self.required)
+        )
+
+
+class IsAuthenticatedAndHasSpecialRole(HasPermissions):
+    required = ('special_resource.read',)
+
+
+class HasScopes(permissions.BasePermission):
+    """
+    Allows service clients whose token was granted every scope in
+    ``required`` (see ``ServiceTokenAuthentication``).
+    """
+    required = ()
+
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == 'editor')
+        scopes = getattr(request.user, 'scopes', None)
+        return scopes is not None and scopes.issuperset(self.required)
+
+
+class CanIntrospectTokens(HasScopes):
+    required = ('auth.introspect',)
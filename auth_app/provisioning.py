@@ -0,0 +1,142 @@
+"""
+Helpers for creating users in bulk, shared by the ``import_users`` command
+and the bulk registration endpoint: cheap per-row validation, a single
+set-based uniqueness query per batch, and ``bulk_create`` inserts.
+"""
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import CustomUser
+from .roles import get_role_table
+
+USERNAME_FIELD = CustomUser._meta.get_field("username")
+EMAIL_FIELD = CustomUser._meta.get_field("email")
+ROLE_FIELD = CustomUser._meta.get_field("role")
+
+
+def clean_row(data):
+    """
+    Validate one input record (``username``, ``email``, ``password`` or an
+    already hashed ``password_hash``, optional ``role``, one of ``AUTH_ROLES``).
+
+    Returns ``(row, errors)``; ``row`` is ``None`` when ``errors`` is not empty.
+    """
+    errors = {}
+    username = CustomUser.normalize_username(str(data.get("username") or "").strip())
+    email = CustomUser.objects.normalize_email(str(data.get("email") or "").strip())
+    password, password_hash = data.get("password"), data.get("password_hash")
+    role = data.get("role") or ROLE_FIELD.default
+
+    if not username:
+        errors["username"] = ["This field is required."]
+    else:
+        try:
+            USERNAME_FIELD.run_validators(username)
+        except ValidationError as e:
+            errors["username"] = e.messages
+
+    if not email:
+        errors["email"] = ["This field is required."]
+    else:
+        try:
+            # Format and the column's max_length.
+            EMAIL_FIELD.run_validators(email)
+        except ValidationError as e:
+            errors["email"] = e.messages
+
+    roles = get_role_table().roles
+    if not isinstance(role, str) or role not in roles:
+        errors["role"] = [f"Choose one of: {', '.join(roles)}."]
+    else:
+        try:
+            ROLE_FIELD.run_validators(role)
+        except ValidationError as e:
+            errors["role"] = e.messages
+
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            errors["password_hash"] = ["Unknown password hash format."]
+    elif not password:
+        errors["password"] = ["This field is required."]
+
+    if errors:
+        return None, errors
+    return {
+        "username": username,
+        "email": email,
+        "password": password,
+        "password_hash": password_hash,
+        "role": role,
+    }, {}
+
+
+def find_conflicts(rows):
+    """
+    Return ``{index: errors}`` for rows whose username or email already exists
+    or repeats an earlier row of the same batch, using a single query. Emails
+    are compared ignoring case, like the unique constraint on them.
+    """
+    usernames = {row["username"] for row in rows}
+    emails = {row["email"].lower() for row in rows}
+    existing_usernames, existing_emails = set(), set()
+    for username, email in CustomUser._default_manager.alias(email_lower=Lower("email")).filter(
+        Q(username__in=usernames) | Q(email_lower__in=emails)
+    ).values_list("username", "email"):
+        existing_usernames.add(username)
+        existing_emails.add(email.lower())
+
+    conflicts = {}
+    for index, row in enumerate(rows):
+        errors = {}
+        if row["username"] in existing_usernames:
+            errors["username"] = ["A user with that username already exists."]
+        if row["email"].lower() in existing_emails:
+            errors["email"] = ["User with this email already exists."]
+        if errors:
+            conflicts[index] = errors
+        existing_usernames.add(row["username"])
+        existing_emails.add(row["email"].lower())
+    return conflicts
+
+
+def hash_passwords(passwords):
+    """Hash a list of raw passwords; top-level so process pools can pickle it."""
+    return [make_password(password) for password in passwords]
+
+
+def build_user(row):
+    return CustomUser(
+        username=row["username"],
+        email=row["email"],
+        role=row["role"],
+        password=row["password_hash"],
+    )
+
+
+def insert_users(users):
+    """
+    Insert ``users`` in one transaction. If a concurrent writer took one of
+    the usernames or emails in the meantime, or the database rejects a value
+    that passed ``clean_row``, fall back to row-by-row inserts and return
+    ``{index: error}`` for the rows that failed.
+    """
+    try:
+        with transaction.atomic():
+            CustomUser._default_manager.bulk_create(users)
+        return {}
+    except (IntegrityError, DataError):
+        pass
+
+    failed = {}
+    for index, user in enumerate(users):
+        try:
+            with transaction.atomic():
+                user.save()
+        except (IntegrityError, DataError) as e:
+            failed[index] = str(e)
+    return failed
@@ -0,0 +1,253 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from .models import CustomUser
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 128-bit digests (double hashing)."""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class _Bucket:
+    __slots__ = ("bloom", "exact")
+
+    def __init__(self, capacity, error_rate):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact = set()
+
+
+class RevocationStore:
+    """
+    Set of revoked token ids (``jti``) that forgets each entry once the token
+    itself has expired.
+
+    Entries are grouped into time buckets by the token's ``exp`` claim. Each
+    bucket holds a Bloom filter in front of an exact set of 64-bit jti
+    digests, so a check probes exactly one bucket and almost always stops at
+    the filter. Buckets whose tokens have all expired are dropped whole, which
+    keeps memory proportional to the revoked tokens that are still alive.
+
+    With ``cache_alias`` set, revocations are also written to that Django
+    cache (with a timeout matching the token's remaining lifetime) so they
+    are shared between worker processes.
+    """
+
+    ERROR_RATE = 0.001
+
+    def __init__(self, bucket_seconds=3600, bucket_capacity=100_000, cache_alias=None):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_capacity = bucket_capacity
+        self.cache_alias = cache_alias
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_prune = 0
+
+    @staticmethod
+    def _digest(jti):
+        return hashlib.blake2b(jti.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _cache_key(jti):
+        return f"revoked-jti:{jti}"
+
+    def _local_contains(self, digest, exp):
+        bucket = self._buckets.get(exp // self.bucket_seconds)
+        if bucket is None or digest not in bucket.bloom:
+            return False
+        return int.from_bytes(digest[:8], "little") in bucket.exact
+
+    def is_revoked(self, jti, exp):
+        if self._local_contains(self._digest(jti), exp):
+            return True
+        if self.cache_alias is not None:
+            return caches[self.cache_alias].get(self._cache_key(jti)) is not None
+        return False
+
+    def revoke(self, jti, exp):
+        """
+        Mark ``jti`` as revoked until ``exp``. Returns ``False`` if it already
+        was, so callers can detect a concurrent reuse of the same token.
+        """
+        now = time.time()
+        if exp <= now:
+            return True
+
+        if self.cache_alias is not None:
+            if not caches[self.cache_alias].add(self._cache_key(jti), 1, timeout=math.ceil(exp - now)):
+                return False
+
+        digest = self._digest(jti)
+        key = int.from_bytes(digest[:8], "little")
+        with self._lock:
+            if now >= self._next_prune:
+                self._prune(now)
+            index = exp // self.bucket_seconds
+            bucket = self._buckets.get(index)
+            if bucket is None:
+                bucket = self._buckets[index] = _Bucket(self.bucket_capacity, self.ERROR_RATE)
+            elif key in bucket.exact:
+                return False
+            bucket.bloom.add(digest)
+            bucket.exact.add(key)
+        return True
+
+    def prune(self, now=None):
+        with self._lock:
+            self._prune(time.time() if now is None else now)
+
+    def _prune(self, now):
+        # Keep one extra bucket so tokens within the verification leeway stay revoked.
+        oldest = int(now) // self.bucket_seconds - 1
+        for index in [index for index in self._buckets if index < oldest]:
+            del self._buckets[index]
+        self._next_prune = now + self.bucket_seconds
+
+    def __len__(self):
+        return sum(len(bucket.exact) for bucket in self._buckets.values())
+
+
+class TokenVersionStore:
+    """
+    Current ``token_version`` of each user. Tokens carry the version they were
+    issued under, so bumping it revokes all of a user's tokens in one write,
+    without an entry per token.
+
+    Versions are held in process for ``ttl`` seconds (at most ``maxsize``
+    users, least recently used first out) and loaded from the database on a
+    miss. With ``cache_alias`` set they live in that Django cache instead, so
+    a bump is seen by every worker at once rather than within ``ttl``.
+    Loads never overwrite a stored version, so a load racing with a bump
+    cannot bring the old version back.
+    """
+
+    def __init__(self, maxsize, ttl, cache_alias=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(pk):
+        return f"token-version:{pk}"
+
+    @staticmethod
+    def _queryset(pk):
+        return CustomUser._default_manager.filter(pk=pk).values_list("token_version", flat=True)
+
+    def _get(self, pk):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is None:
+                return None
+            version, expires = entry
+            if expires <= now:
+                del self._entries[pk]
+                return None
+            self._entries.move_to_end(pk)
+            return version
+
+    def _store(self, pk, version, replace):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if not replace and pk in self._entries:
+                return
+            self._entries[pk] = (version, time.monotonic() + self.ttl)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def current(self, pk):
+        """The user's version, or ``None`` if there is no such user."""
+        if self.cache_alias is not None:
+            version = caches[self.cache_alias].get(self._cache_key(pk))
+        else:
+            version = self._get(pk)
+        if version is None:
+            version = self._queryset(pk).first()
+            if version is not None:
+                self.set(pk, version, replace=False)
+        return version
+
+    async def acurrent(self, pk):
+        """Async variant of ``current``."""
+        if self.cache_alias is not None:
+            version = await caches[self.cache_alias].aget(self._cache_key(pk))
+        else:
+            version = self._get(pk)
+        if version is None:
+            version = await self._queryset(pk).afirst()
+            if version is not None:
+                if self.cache_alias is not None:
+                    await caches[self.cache_alias].aadd(self._cache_key(pk), version, timeout=None)
+                else:
+                    self._store(pk, version, replace=False)
+        return version
+
+    def set(self, pk, version, replace=True):
+        if self.cache_alias is None:
+            self._store(pk, version, replace)
+        elif replace:
+            caches[self.cache_alias].set(self._cache_key(pk), version, timeout=None)
+        else:
+            caches[self.cache_alias].add(self._cache_key(pk), version, timeout=None)
+
+    def bump(self, pk):
+        """Revoke every token issued to user ``pk`` so far; returns the new version."""
+        queryset = self._queryset(pk)
+        with transaction.atomic():
+            queryset.update(token_version=F("token_version") + 1)
+            version = queryset.first()
+        if version is not None:
+            self.set(pk, version)
+        return version
+
+    def forget(self, pk):
+        if self.cache_alias is not None:
+            caches[self.cache_alias].delete(self._cache_key(pk))
+        with self._lock:
+            self._entries.pop(pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+revocations = RevocationStore(
+    settings.AUTH_REVOCATION_BUCKET_SECONDS,
+    settings.AUTH_REVOCATION_BUCKET_CAPACITY,
+    settings.AUTH_REVOCATION_CACHE,
+)
+
+token_versions = TokenVersionStore(
+    settings.AUTH_TOKEN_VERSION_CACHE_SIZE,
+    settings.AUTH_TOKEN_VERSION_CACHE_TTL,
+    settings.AUTH_REVOCATION_CACHE,
+)
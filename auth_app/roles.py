@@ -0,0 +1,91 @@
+"""
+Role-based permissions compiled to bitmasks.
+
+``AUTH_PERMISSIONS`` lists the permission names; a permission's position is
+its bit, so the list may only be appended to. ``AUTH_ROLES`` maps each role to
+its permissions. The table is compiled once per process, every role becomes a
+single integer, and issued tokens carry the mask of the user's role (``perms``)
+together with a digest of the table they were compiled from (``rv``).
+Permission checks are then one ``&`` on an integer, without database access.
+
+Tokens minted under a different table (the digest does not match after the
+roles were changed and deployed) are not trusted: their mask is recompiled from
+the ``role`` claim against the current table.
+"""
+import hashlib
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+PERMISSIONS_CLAIM = "perms"
+ROLE_TABLE_CLAIM = "rv"
+
+
+class RoleTable:
+    def __init__(self, permissions, roles):
+        if len(set(permissions)) != len(permissions):
+            raise ImproperlyConfigured("AUTH_PERMISSIONS contains duplicate names.")
+        self.bits = {name: 1 << index for index, name in enumerate(permissions)}
+        self.roles = {role: self.mask(names) for role, names in roles.items()}
+        self.digest = hashlib.blake2b(
+            json.dumps([list(permissions), roles], sort_keys=True).encode(), digest_size=6
+        ).hexdigest()
+        self._required = {}
+
+    def mask(self, names):
+        """Compile permission names into a bitmask."""
+        mask = 0
+        for name in names:
+            try:
+                mask |= self.bits[name]
+            except KeyError:
+                raise ImproperlyConfigured(f"Unknown permission {name!r}, add it to AUTH_PERMISSIONS.")
+        return mask
+
+    def required_mask(self, names):
+        """Like ``mask``, memoized for the fixed requirements of permission classes."""
+        try:
+            return self._required[names]
+        except KeyError:
+            mask = self._required[names] = self.mask(names)
+            return mask
+
+    def role_mask(self, role):
+        """Permissions of ``role``; unknown roles have none."""
+        return self.roles.get(role, 0)
+
+    def claims(self, role):
+        return {PERMISSIONS_CLAIM: self.role_mask(role), ROLE_TABLE_CLAIM: self.digest}
+
+
+@lru_cache(maxsize=None)
+def get_role_table():
+    return RoleTable(settings.AUTH_PERMISSIONS, settings.AUTH_ROLES)
+
+
+def permission_mask(user):
+    """
+    Permission bits of an authenticated user: taken from the token of a
+    ``ClaimsUser`` when it was compiled from the current table, otherwise
+    looked up for the user's role.
+    """
+    table = get_role_table()
+    token = getattr(user, "token", None)
+    if token is not None and token.get(ROLE_TABLE_CLAIM) == table.digest:
+        return token.get(PERMISSIONS_CLAIM, 0)
+    return table.role_mask(user.role)
+
+
+def has_permissions(user, names):
+    required = get_role_table().required_mask(tuple(names))
+    return permission_mask(user) & required == required
+
+
+@receiver(setting_changed)
+def reset_role_table(setting, **kwargs):
+    if setting in ("AUTH_PERMISSIONS", "AUTH_ROLES"):
+        get_role_table.cache_clear()
@@ -0,0 +1,62 @@
+"""
+Database router sending reads to the replicas in ``DATABASE_REPLICAS`` and
+writes to ``default``.
+
+Once a request (or any other context, e.g. a management command) has
+written, its later reads go to ``default`` as well, so users always see
+their own changes despite replication lag. ``ReplicaPinMiddleware`` runs
+every request in its own scope; after a write it sets the ``PIN_COOKIE``
+for ``DATABASE_REPLICA_PIN_SECONDS``, and requests sending it back start
+pinned, so e.g. a login right after registering finds the new account.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "auth_primary_pin"
+
+_pinned = ContextVar("auth_db_pinned_to_primary", default=False)
+_wrote = ContextVar("auth_db_wrote", default=False)
+
+
+def pin_primary():
+    _pinned.set(True)
+    _wrote.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def wrote():
+    """Whether the current scope has written."""
+    return _wrote.get()
+
+
+@contextmanager
+def request_scope(pinned=False):
+    """Start unpinned (or ``pinned``), and restore the previous state afterwards."""
+    pinned_token, wrote_token = _pinned.set(pinned), _wrote.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _pinned.get() or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
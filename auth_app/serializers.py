@@ -1,5 +1,13 @@
+from django.utils.translation import gettext_lazy as _
+from django.db.models.functions import Lower
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from . import hashing, provisioning
 from .models import CustomUser
+from .tokens import RefreshToken, rotate, token_version
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -8,10 +16,134 @@ class UserSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = ['username', 'email', 'password']
 
+    def validate_email(self, value):
+        # Unique ignoring case (see CustomUser.Meta.constraints), which the
+        # default UniqueValidator does not check.
+        queryset = CustomUser._default_manager.alias(email_lower=Lower('email')).filter(email_lower=value.lower())
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError(_('User with this email already exists.'))
+        return value
+
     def create(self, validated_data):
-        user = CustomUser.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
+        # Same as CustomUser.objects.create_user(), with the hash computed on
+        # the hashing pool.
+        user = CustomUser(
+            username=CustomUser.normalize_username(validated_data['username']),
+            email=CustomUser.objects.normalize_email(validated_data['email']),
         )
+        user.password = hashing.make_password(validated_data['password'])
+        user.save()
         return user
+
+    def update(self, instance, validated_data):
+        password = validated_data.pop('password', None)
+        if password is not None:
+            instance.password = hashing.make_password(password)
+        return super().update(instance, validated_data)
+
+
+class UserReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path for UserSerializer: copies the readable fields, which
+    are all plain strings, straight from model instances or ``.values()``
+    dicts instead of running DRF field introspection and per-field
+    ``to_representation`` for every object. The rendered output is identical.
+    """
+    read_fields = tuple(
+        name for name, field in UserSerializer().fields.items() if not field.write_only
+    )
+
+    def to_representation(self, instance):
+        if isinstance(instance, dict):
+            return {name: instance[name] for name in self.read_fields}
+        return {name: getattr(instance, name) for name in self.read_fields}
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues token pairs carrying the user claims used by stateless authentication."""
+    token_class = RefreshToken
+
+
+class KeyRingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes token pairs signed by the configured signing key ring, unless
+    the user logged out everywhere since the token was issued.
+    """
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user = None
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            user = CustomUser._default_manager.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+            if token_version(refresh) != user.token_version:
+                raise TokenError(_("Token has been revoked"))
+
+        return rotate(refresh, user)
+
+
+class TokenIntrospectionSerializer(serializers.Serializer):
+    MAX_TOKENS = 500
+
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=MAX_TOKENS,
+    )
+
+
+class BulkRegisterSerializer(serializers.Serializer):
+    """
+    Validates and creates a batch of users with one uniqueness query and one
+    INSERT transaction. Invalid items are reported instead of failing the batch.
+    """
+    # Every password is hashed while the request waits, on part of the
+    # hashing pool; larger imports go through the import_users command.
+    MAX_USERS = 100
+    FIELDS = ('username', 'email', 'password', 'role')
+
+    users = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_USERS,
+    )
+
+    def create(self, validated_data):
+        items = validated_data['users']
+        results = [None] * len(items)
+        password_length = UserSerializer().fields['password'].min_length
+
+        rows, indexes = [], []
+        for index, item in enumerate(items):
+            row, errors = provisioning.clean_row({field: item.get(field) for field in self.FIELDS})
+            if row and (not isinstance(row['password'], str) or len(row['password']) < password_length):
+                row, errors = None, {'password': [f'Ensure this field has at least {password_length} characters.']}
+            if errors:
+                results[index] = {'status': 'error', 'errors': errors}
+                continue
+            rows.append(row)
+            indexes.append(index)
+
+        conflicts = provisioning.find_conflicts(rows)
+        for position, errors in conflicts.items():
+            results[indexes[position]] = {'status': 'error', 'errors': errors}
+        rows = [row for position, row in enumerate(rows) if position not in conflicts]
+        indexes = [index for position, index in enumerate(indexes) if position not in conflicts]
+
+        for row, encoded in zip(rows, hashing.make_passwords([row['password'] for row in rows])):
+            row['password_hash'] = encoded
+
+        users = [provisioning.build_user(row) for row in rows]
+        failed = provisioning.insert_users(users)
+        for position, (index, user) in enumerate(zip(indexes, users)):
+            if position in failed:
+                results[index] = {'status': 'error', 'errors': {'non_field_errors': [failed[position]]}}
+            else:
+                results[index] = {'status': 'created', 'id': user.pk}
+        return results
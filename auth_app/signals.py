@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+from .clients import client_tokens
+from .models import CustomUser, ServiceClient
+from .revocation import token_versions
+from .tokens import USER_CLAIMS, revoke_user_tokens
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers password changes, profile updates and admin edits alike.
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+def store_token_version(sender, instance, update_fields=None, **kwargs):
+    # Also lets tokens of a new user be checked without loading its version.
+    if update_fields is None or "token_version" in update_fields:
+        token_versions.set(instance.pk, instance.token_version)
+
+
+@receiver(pre_save, sender=CustomUser)
+def detect_claim_changes(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    # Issued tokens carry these fields (and the permissions of the role).
+    instance._claims_changed = False
+    if raw or instance._state.adding:
+        return
+    fields = [field for field in USER_CLAIMS if update_fields is None or field in update_fields]
+    if not fields:
+        return
+    stored = sender._default_manager.using(using).filter(pk=instance.pk).values(*fields).first()
+    instance._claims_changed = stored is not None and any(
+        stored[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_tokens_on_claim_change(sender, instance, **kwargs):
+    # A demoted or deactivated user must not keep working with the old claims;
+    # registered after store_token_version so the bumped version is kept.
+    if getattr(instance, "_claims_changed", False):
+        instance._claims_changed = False
+        revoke_user_tokens(instance)
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_token_version(sender, instance, **kwargs):
+    token_versions.forget(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ServiceClient)
+def invalidate_service_client(sender, instance, **kwargs):
+    # Disabled clients and rotated secrets take effect on the next request.
+    client_tokens.invalidate(instance.client_id)
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalWindowStore:
+    """
+    In-process sliding-window counters: two integers per key, with the least
+    recently used keys evicted once ``max_keys`` is reached.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, duration, now=None):
+        now = time.time() if now is None else now
+        index, elapsed = divmod(now, duration)
+        with self._lock:
+            window, current, previous = self._counters.get(key, (index, 0, 0))
+            if window != index:
+                previous = current if window == index - 1 else 0
+                current = 0
+            allowed, wait = _check(previous, current, limit, duration, elapsed)
+            if allowed:
+                current += 1
+            self._counters[key] = (index, current, previous)
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class CacheWindowStore:
+    """
+    Sliding-window counters kept in a Django cache, so limits hold across
+    worker processes. Each key costs two short-lived integer entries.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def hit(self, key, limit, duration, now=None):
+        cache = caches[self.alias]
+        now = time.time() if now is None else now
+        index, elapsed = divmod(now, duration)
+        current_key, previous_key = f"{key}:{int(index)}", f"{key}:{int(index) - 1}"
+
+        counts = cache.get_many([current_key, previous_key])
+        allowed, wait = _check(counts.get(previous_key, 0), counts.get(current_key, 0), limit, duration, elapsed)
+        if allowed:
+            cache.add(current_key, 0, timeout=int(duration * 2) + 1)
+            cache.incr(current_key)
+        return allowed, wait
+
+    def clear(self):
+        pass
+
+
+def _check(previous, current, limit, duration, elapsed):
+    """
+    Sliding window counter: the previous window's count is weighted by how
+    much of it still overlaps the sliding window.
+    """
+    if previous * (1 - elapsed / duration) + current < limit:
+        return True, 0
+    if current >= limit:
+        return False, duration - elapsed
+    return False, max(0, duration * (1 - (limit - current) / previous) - elapsed)
+
+
+def get_store():
+    if settings.AUTH_THROTTLE_CACHE:
+        return CacheWindowStore(settings.AUTH_THROTTLE_CACHE)
+    return local_store
+
+
+local_store = LocalWindowStore(settings.AUTH_THROTTLE_MAX_KEYS)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Like DRF's ``ScopedRateThrottle`` (the rate is looked up under
+    ``<view.throttle_scope>_<scope_suffix>`` in ``DEFAULT_THROTTLE_RATES``),
+    but counting with a sliding window counter instead of storing a
+    timestamp per request. Only reads the request headers and body, so a
+    rejected attempt costs neither a password hash nor a query.
+    """
+
+    scope_suffix = None
+
+    def __init__(self):
+        # The rate depends on the view, it is resolved in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = f"{getattr(view, 'throttle_scope', None)}_{self.scope_suffix}"
+        if self.scope not in self.THROTTLE_RATES:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = get_store().hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    scope_suffix = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class UsernameRateThrottle(SlidingWindowThrottle):
+    scope_suffix = "username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if isinstance(request.data, dict) else None
+        if not isinstance(username, str) or not username:
+            return None
+        ident = hashlib.blake2b(username.strip().lower().encode(), digest_size=16).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class CallerRateThrottle(SlidingWindowThrottle):
+    """Counts per authenticated caller: the service client, or the user."""
+    scope_suffix = "caller"
+
+    def get_cache_key(self, request, view):
+        user = request.user
+        ident = getattr(user, "client_id", None) or getattr(user, "pk", None)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": f"{type(user).__name__}:{ident}"}
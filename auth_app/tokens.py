@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from . import metrics
+from .cache import user_cache
+from .keys import get_token_backend
+from .models import CustomUser
+from .revocation import revocations, token_versions
+from .roles import get_role_table
+
+# Claims copied from the user row into every issued token, so that stateless
+# authentication can rebuild the user without a database lookup.
+USER_CLAIMS = ("role", "is_superuser", "is_active")
+# The user's token_version when the token was issued; tokens issued before
+# the last bump are rejected.
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def user_claims(user):
+    """
+    Return the user fields that are embedded in issued tokens, plus the
+    permission bitmask of the user's role (see ``auth_app.roles``) and the
+    user's token version.
+    """
+    claims = {claim: getattr(user, claim) for claim in USER_CLAIMS}
+    claims.update(get_role_table().claims(user.role))
+    claims[TOKEN_VERSION_CLAIM] = user.token_version
+    return claims
+
+
+def stamp_user_claims(token, user):
+    """Write the current ``user_claims`` of ``user`` into ``token``."""
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+
+
+def token_version(token):
+    # Tokens issued before the claim existed belong to version 0.
+    return token.get(TOKEN_VERSION_CLAIM, 0)
+
+
+def revoke_user_tokens(user):
+    """Log ``user`` out everywhere: every token issued so far stops working."""
+    user.token_version = token_versions.bump(user.pk)
+    # The bump is a queryset update, which sends no post_save.
+    user_cache.invalidate(user.pk)
+
+
+class KeyRingTokenMixin:
+    """
+    Signs and verifies through the backend chosen by ``get_token_backend``,
+    timing both for the metrics endpoint.
+    """
+
+    def __init__(self, token=None, verify=True):
+        if token is None:
+            super().__init__(token, verify)
+            return
+        with metrics.TOKEN_VERIFY_SECONDS.time(self.token_type):
+            super().__init__(token, verify)
+
+    def __str__(self):
+        with metrics.TOKEN_SIGN_SECONDS.time(self.token_type):
+            return super().__str__()
+
+    @property
+    def token_backend(self):
+        return get_token_backend()
+
+
+class AccessToken(KeyRingTokenMixin, tokens.AccessToken):
+    pass
+
+
+class RefreshToken(KeyRingTokenMixin, tokens.RefreshToken):
+    """
+    Refresh token checked against the in-process revocation store. Takes the
+    place of simplejwt's database blacklist for ``BLACKLIST_AFTER_ROTATION``.
+    """
+    access_token_class = AccessToken
+
+    def verify(self):
+        super().verify()
+        if revocations.is_revoked(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        # Fails if the token was revoked in the meantime, e.g. by a concurrent
+        # refresh with the same token.
+        if not revocations.revoke(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        stamp_user_claims(token, user)
+        return token
+
+
+class ServiceToken(KeyRingTokenMixin, tokens.Token):
+    """
+    Token of a service client from the client credentials grant. Names the
+    client (``client_id``) and its granted ``scope`` instead of a user, and
+    has its own ``token_type`` so it is never accepted as a user's token.
+    """
+    token_type = "service"
+
+    @property
+    def lifetime(self):
+        return timedelta(seconds=settings.AUTH_SERVICE_TOKEN_LIFETIME)
+
+    @classmethod
+    def for_client(cls, client, scopes):
+        token = cls()
+        token["client_id"] = client.client_id
+        token["scope"] = " ".join(sorted(scopes))
+        return token
+
+
+def rotate(refresh, user=None):
+    """
+    New token data for a verified refresh token: an access token and, with
+    ``ROTATE_REFRESH_TOKENS``, a new refresh token replacing the revoked one.
+    The claims are taken from ``user``, the freshly loaded owner of the token,
+    so role and status changes reach the new tokens instead of being carried
+    over from the old one.
+    """
+    if user is not None:
+        stamp_user_claims(refresh, user)
+    data = {"access": str(refresh.access_token)}
+
+    if api_settings.ROTATE_REFRESH_TOKENS:
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            refresh.blacklist()
+
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+
+        data["refresh"] = str(refresh)
+
+    return data
+
+
+def introspect(raw_tokens):
+    """
+    Validate a batch of encoded access tokens.
+
+    Signatures are checked in a single pass and the owning users are fetched
+    with one ``IN`` query. Returns one result per token, in input order.
+    """
+    payloads = {}
+    for raw in raw_tokens:
+        if raw not in payloads:
+            try:
+                payloads[raw] = AccessToken(raw).payload
+            except TokenError:
+                payloads[raw] = None
+
+    user_ids = {
+        payload[api_settings.USER_ID_CLAIM]
+        for payload in payloads.values()
+        if payload and api_settings.USER_ID_CLAIM in payload
+    }
+    users = {
+        pk: (role, version)
+        for pk, role, version in CustomUser.objects.filter(
+            pk__in=user_ids, is_active=True,
+        ).values_list("pk", "role", "token_version")
+    }
+
+    results = []
+    for raw in raw_tokens:
+        payload = payloads[raw]
+        user_id = payload.get(api_settings.USER_ID_CLAIM) if payload else None
+        if user_id not in users or token_version(payload) != users[user_id][1]:
+            results.append({"active": False})
+            continue
+        results.append({
+            "active": True,
+            "exp": payload["exp"],
+            "user_id": user_id,
+            "role": users[user_id][0],
+        })
+    return results
@@ -1,15 +1,33 @@
+from django.conf import settings
 from django.urls import path
-from .views import CheckLoginView, RegisterView, ChangePasswordView
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+
+from .views import CheckLoginView, RegisterView, BulkRegisterView, ChangePasswordView, IntrospectTokensView, JWKSView, LoginView, LogoutAllView, client_token, gateway_auth
+from rest_framework_simplejwt.views import TokenRefreshView
+
+
+if settings.AUTH_ASYNC_VIEWS:
+    # Only imported when used, to keep it off the boot path.
+    from . import async_views
+
+    check_view = async_views.check_login
+    login_view = async_views.login
+    refresh_view = async_views.refresh
+else:
+    check_view = CheckLoginView.as_view()
+    login_view = LoginView.as_view()
+    refresh_view = TokenRefreshView.as_view()
 
 
 urlpatterns = [
-    path('check/', CheckLoginView.as_view(), name='check_login'),
+    path('check/', check_view, name='check_login'),
+    path('gateway/', gateway_auth, name='gateway_auth'),
     path('register/', RegisterView.as_view(), name='register'),
-    path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('register/bulk/', BulkRegisterView.as_view(), name='register_bulk'),
+    path('login/', login_view, name='token_obtain_pair'),
+    path('refresh/', refresh_view, name='token_refresh'),
+    path('token/', client_token, name='client_token'),
     path('change-password/', ChangePasswordView.as_view(), name='change-password'),
+    path('logout-all/', LogoutAllView.as_view(), name='logout_all'),
+    path('introspect/', IntrospectTokensView.as_view(), name='token_introspect'),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
 ]
@@ -1,17 +1,41 @@
+import json
+from datetime import datetime, time
+
 from rest_framework.views import APIView
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import status
+from rest_framework import exceptions, status
 from rest_framework.generics import ListAPIView
+from rest_framework.filters import OrderingFilter
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from .authentication import GatewayClaimsJWTAuthentication, GatewayJWTAuthentication, ServiceTokenAuthentication
 from .models import CustomUser
-from .serializers import UserSerializer
-from .permissions import IsOwnerOrAdmin, IsAdminUser, IsAuthenticatedAndHasSpecialRole
+from .serializers import UserSerializer, UserReadSerializer, TokenIntrospectionSerializer, BulkRegisterSerializer
+from .tokens import RefreshToken, introspect, revoke_user_tokens
+from .keys import get_jwks
+from .exports import CONTENT_TYPES, stream_users
+from . import clients, hashing, metrics
+from .pagination import ProfileCursorPagination
+from .throttling import CallerRateThrottle, IPRateThrottle, UsernameRateThrottle
+from .permissions import CanIntrospectTokens, IsOwnerOrAdmin, IsAdminUser, IsAuthenticatedAndHasSpecialRole
 
 
 class RegisterView(APIView):
+    authentication_classes = []
     permission_classes = []
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'register'
 
     def post(self, request):
         serializer = UserSerializer(data=request.data)
@@ -20,6 +44,25 @@ class RegisterView(APIView):
             return Response({"message": "User registered successfully"}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class BulkRegisterView(APIView):
+    """Creates up to BulkRegisterSerializer.MAX_USERS accounts per request, admins only."""
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def post(self, request):
+        serializer = BulkRegisterSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        results = serializer.save()
+        created = sum(result['status'] == 'created' for result in results)
+        # 207 when some of the items were rejected.
+        code = status.HTTP_201_CREATED if created == len(results) else status.HTTP_207_MULTI_STATUS
+        return Response({"created": created, "results": results}, status=code)
+
+class LoginView(TokenObtainPairView):
+    """TokenObtainPairView throttled per client IP and per username."""
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'login'
+
 class CheckLoginView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -27,13 +70,45 @@ class CheckLoginView(APIView):
         # Jeśli użytkownik jest zalogowany, zwróci status 200
         return Response({"message": "User is authenticated"}, status=status.HTTP_200_OK)
 
+class IntrospectTokensView(APIView):
+    """
+    Validates a batch of access tokens on behalf of downstream services.
+    Callers are service clients granted ``auth.introspect``, or admins.
+    """
+    authentication_classes = [ServiceTokenAuthentication, *APIView.authentication_classes]
+    permission_classes = [CanIntrospectTokens | IsAdminUser]
+    throttle_classes = [CallerRateThrottle]
+    throttle_scope = 'introspect'
+
+    def post(self, request):
+        serializer = TokenIntrospectionSerializer(data=request.data)
+        if serializer.is_valid():
+            results = introspect(serializer.validated_data['tokens'])
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class JWKSView(APIView):
+    """Publishes the public signing keys so services can verify tokens locally."""
+    authentication_classes = []
+    permission_classes = []
+    cache_max_age = 300
+
+    def get(self, request):
+        response = Response(get_jwks(), status=status.HTTP_200_OK)
+        patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        return response
+
 class ProfileView(viewsets.ModelViewSet):
     """Allows users to retrieve and edit their own profile."""
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
+    pagination_class = ProfileCursorPagination
+    # Only unique, indexed keys, so cursors stay cheap and stable.
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['id', 'username']
 
     def get_permissions(self):
-        if self.action == 'list':  # /api/users/
+        if self.action in ['list', 'export']:  # /api/users/
             permission_classes = [IsAdminUser]  # Only Admins
         elif self.action in ['retrieve', 'update', 'create', 'partial_update', 'destroy']:  # /api/users/<id>/
             permission_classes = [IsAuthenticated, IsOwnerOrAdmin]  # Owner user or Admin
@@ -42,6 +117,47 @@ class ProfileView(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Plain dicts are enough for UserReadSerializer and the cursors.
+            queryset = queryset.values(*{*self.ordering_fields, *UserReadSerializer.read_fields})
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ['list', 'retrieve']:
+            return UserReadSerializer
+        return super().get_serializer_class()
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Streams every user as NDJSON, or CSV with ``?output=csv``, in id order.
+        ``?since=`` (ISO date or datetime) limits it to users who joined at or after it.
+        """
+        output = request.query_params.get('output', 'ndjson')
+        if output not in CONTENT_TYPES:
+            return Response({"output": [f"Choose one of: {', '.join(CONTENT_TYPES)}."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = CustomUser.objects.order_by('id')
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_datetime(since) or parse_date(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({"since": ["Expected an ISO 8601 date or datetime."]}, status=status.HTTP_400_BAD_REQUEST)
+            if not hasattr(since, 'hour'):
+                since = datetime.combine(since, time.min)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            queryset = queryset.filter(date_joined__gte=since)
+
+        response = StreamingHttpResponse(stream_users(queryset, output), content_type=CONTENT_TYPES[output])
+        response['Content-Disposition'] = f'attachment; filename="users.{output}"'
+        return response
+
     def get_object(self):
         """Retrieve and return a profile instance."""
         self.get_permissions()
@@ -58,17 +174,114 @@ class ChangePasswordView(APIView):
 
         data = request.data
         user = request.user
-        if user.check_password(data['old_password']):
-            user.set_password(data['new_password'])
-            user.save()
-            return Response({"message": "Password successfully changed"}, status=status.HTTP_200_OK)
+        if hashing.check_password(data['old_password'], user.password):
+            user.password = hashing.make_password(data['new_password'])
+            user.save(update_fields=['password'])
+            # Wylogowanie ze wszystkich sesji; klient dostaje nową parę tokenów.
+            revoke_user_tokens(user)
+            refresh = RefreshToken.for_user(user)
+            return Response({
+                "message": "Password successfully changed",
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+            }, status=status.HTTP_200_OK)
         else:
             return Response({"message": "Wrong password"}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutAllView(APIView):
+    """Revokes every token of the user, on all devices, with one update."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revoke_user_tokens(request.user)
+        return Response({"message": "Logged out everywhere"}, status=status.HTTP_200_OK)
+
+
 class SpecialResourceView(ListAPIView):
     """Allows editors to retrieve special resources."""
     permission_classes = [IsAuthenticatedAndHasSpecialRole]
     def get(self, request, *args, **kwargs):
         data = []
         return Response(data, status=status.HTTP_200_OK)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, protected by AUTH_METRICS_TOKEN; not served until it is set."""
+    if not settings.AUTH_METRICS_TOKEN:
+        raise Http404()
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.AUTH_METRICS_TOKEN}"
+    ):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    registry = metrics.registry
+    return HttpResponse(registry.render(registry.collect_all()), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# Stateless, so one instance of each serves every request.
+_gateway_authentication = {
+    False: GatewayJWTAuthentication(),
+    True: GatewayClaimsJWTAuthentication(),
+}
+
+
+@csrf_exempt
+def gateway_auth(request):
+    """
+    ``auth_request`` endpoint for the reverse proxy: an empty 200 with the
+    user in ``X-Auth-User-Id`` and ``X-Auth-User-Role``, or an empty 401.
+    A plain Django view, as DRF's dispatch and rendering would cost more than
+    checking the token.
+    """
+    authentication = _gateway_authentication[settings.AUTH_STATELESS_TOKENS]
+    try:
+        result = authentication.authenticate(request)
+    except exceptions.AuthenticationFailed:
+        result = None
+    if result is None:
+        response = HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        response["WWW-Authenticate"] = authentication.authenticate_header(request)
+        return response
+
+    user, _ = result
+    response = HttpResponse()
+    response["X-Auth-User-Id"] = str(user.pk)
+    response["X-Auth-User-Role"] = user.role
+    return response
+
+
+@csrf_exempt
+@require_POST
+def client_token(request):
+    """
+    Client credentials grant (RFC 6749, section 4.4) for services, as a plain
+    Django view. The client authenticates with HTTP Basic or with
+    ``client_id``/``client_secret`` form or JSON fields.
+    """
+    credentials = clients.basic_credentials(request.META.get("HTTP_AUTHORIZATION", ""))
+    try:
+        response = JsonResponse(_grant(request, credentials))
+    except clients.GrantError as e:
+        response = JsonResponse({"error": e.error}, status=e.status)
+        if e.status == status.HTTP_401_UNAUTHORIZED and credentials:
+            response["WWW-Authenticate"] = 'Basic realm="api"'
+    # Token responses must not be cached.
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def _grant(request, credentials):
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            data = None
+    else:
+        data = request.POST
+    if not isinstance(data, dict):
+        raise clients.GrantError("invalid_request")
+    if data.get("grant_type") != "client_credentials":
+        raise clients.GrantError("unsupported_grant_type")
+
+    client_id, client_secret = credentials or (data.get("client_id"), data.get("client_secret"))
+    return clients.grant_token(client_id, client_secret, data.get("scope"))
@@ -0,0 +1,49 @@
+"""Per-call cost of the gateway auth_request endpoint vs GET /auth/check/."""
+from unittest import mock
+
+from common import bench, report, test_database
+
+from django.core.handlers.base import BaseHandler
+from django.test import RequestFactory, override_settings
+
+from auth_app.authentication import CachedJWTAuthentication, ClaimsJWTAuthentication
+from auth_app.models import CustomUser
+from auth_app.tokens import RefreshToken
+from auth_app.views import CheckLoginView, gateway_auth
+
+with test_database():
+    user = CustomUser.objects.create_user(username="bench", email="bench@example.com", password="benchpassword")
+    token = RefreshToken.for_user(user).access_token
+    request_factory = RequestFactory()
+    handler = BaseHandler()
+    handler.load_middleware()
+
+    def view(func, path):
+        # The views don't modify the request, so one is built up front.
+        request = request_factory.get(path, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        def run():
+            assert func(request).status_code == 200
+        return run
+
+    def full_stack(path):
+        def run():
+            request = request_factory.get(path, HTTP_AUTHORIZATION=f"Bearer {token}")
+            assert handler.get_response(request).status_code == 200
+        return run
+
+    cases = [
+        ("CheckLoginView", view(CheckLoginView.as_view(), "/auth/check/")),
+        ("gateway_auth", view(gateway_auth, "/auth/gateway/")),
+        ("GET /auth/check/ (full stack)", full_stack("/auth/check/")),
+        ("GET /auth/gateway/ (full stack)", full_stack("/auth/gateway/")),
+    ]
+    for stateless in (False, True):
+        print(f"AUTH_STATELESS_TOKENS={stateless}")
+        # CheckLoginView took its authentication class from REST_FRAMEWORK at
+        # import, so the setting alone would only switch gateway_auth.
+        authentication = ClaimsJWTAuthentication if stateless else CachedJWTAuthentication
+        with override_settings(AUTH_STATELESS_TOKENS=stateless), \
+                mock.patch.object(CheckLoginView, "authentication_classes", [authentication]):
+            for name, func in cases:
+                report(f"  {name}", bench(func, number=2000))
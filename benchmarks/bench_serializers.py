@@ -0,0 +1,33 @@
+"""Per-object cost of UserSerializer vs UserReadSerializer for profile reads."""
+from common import bench, report
+
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.models import CustomUser
+from auth_app.serializers import UserReadSerializer, UserSerializer
+
+OBJECTS = 100
+
+users = [CustomUser(id=i, username=f"user{i}", email=f"user{i}@example.com") for i in range(OBJECTS)]
+rows = [{"id": u.id, "username": u.username, "email": u.email} for u in users]
+renderer = JSONRenderer()
+
+assert renderer.render(UserSerializer(users, many=True).data) == renderer.render(UserReadSerializer(users, many=True).data)
+assert renderer.render(UserSerializer(users, many=True).data) == renderer.render(UserReadSerializer(rows, many=True).data)
+
+print(f"per object, lists of {OBJECTS}:")
+baseline = bench(lambda: UserSerializer(users, many=True).data, number=100)
+report("UserSerializer (instances)", baseline, per=OBJECTS)
+fast = bench(lambda: UserReadSerializer(users, many=True).data, number=100)
+report("UserReadSerializer (instances)", fast, per=OBJECTS)
+values = bench(lambda: UserReadSerializer(rows, many=True).data, number=100)
+report("UserReadSerializer (.values() dicts)", values, per=OBJECTS)
+
+print("single object (retrieve):")
+single = bench(lambda: UserSerializer(users[0]).data, number=2000)
+report("UserSerializer", single)
+single_fast = bench(lambda: UserReadSerializer(users[0]).data, number=2000)
+report("UserReadSerializer", single_fast)
+
+print(f"speedup: list {baseline[0] / fast[0]:.1f}x (values {baseline[0] / values[0]:.1f}x), "
+      f"retrieve {single[0] / single_fast[0]:.1f}x")
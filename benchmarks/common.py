@@ -0,0 +1,54 @@
+"""
+Shared setup for the micro-benchmarks in this directory. Run them from the
+repository root, e.g. ``python benchmarks/bench_serializers.py``.
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tsk_auth_service.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+
+def bench(func, number=1000, repeat=5):
+    """Best-of-``repeat`` seconds per call of ``func``, and the median."""
+    timings = []
+    func()  # warm up
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings), statistics.median(timings)
+
+
+def report(name, timings, per=1):
+    best, median = timings
+    print(f"{name:<40} {best / per * 1e6:10.2f} us  (median {median / per * 1e6:.2f} us)")
+
+
+@contextmanager
+def test_database(name=None):
+    """
+    Run against a throwaway test database instead of the configured one.
+    ``name`` overrides the test database name, e.g. to get a file-backed
+    SQLite database that several threads can write to.
+    """
+    from django.db import connection
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+    if name:
+        connection.settings_dict["TEST"]["NAME"] = name
+    setup_test_environment()
+    config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(config, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,309 @@
+"""
+Load and latency benchmark for the auth endpoints.
+
+Drives login, refresh, check, register and profile either in-process
+(Django test client on a throwaway database, with DB queries counted per
+request) or against a running server, with ``--concurrency`` client threads.
+Reports requests/s, p50/p95/p99 latency, errors and queries per request,
+optionally saves them as JSON and compares them with a stored baseline:
+
+    python benchmarks/loadtest.py --requests 500 --concurrency 8 --output baseline.json
+    python benchmarks/loadtest.py --requests 500 --concurrency 8 --baseline baseline.json
+
+Against a server, start it with the throttles raised, e.g.
+``AUTH_LOGIN_IP_RATE=1000000/s AUTH_LOGIN_USERNAME_RATE=1000000/s
+AUTH_REGISTER_IP_RATE=1000000/s AUTH_REGISTER_USERNAME_RATE=1000000/s``,
+and pass ``--url http://127.0.0.1:8000``. The process exits with status 1 when
+the comparison finds a regression.
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINTS = ("login", "refresh", "check", "register", "profile")
+PASSWORD = "benchmark-password-123"
+UNLIMITED = "1000000/s"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Base URL of a running server; in-process when omitted.")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma separated subset of %(default)s.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint (default %(default)s).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client threads (default %(default)s).")
+    parser.add_argument(
+        "--pbkdf2-iterations", type=int,
+        help="In-process only: PBKDF2 work factor, to benchmark around the hash cost.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with the results in this JSON file.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Relative change in requests/s or p99 counted as a regression (default %(default)s).",
+    )
+    parser.add_argument(
+        "--min-p99-delta-ms", type=float, default=1.0,
+        help="Ignore p99 increases smaller than this, which are noise (default %(default)s).",
+    )
+    args = parser.parse_args()
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+class InProcessTarget:
+    """Django test client per thread; counts the queries of every request."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, data=None, token=None):
+        from django.db import connection
+        from django.test import Client
+
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client()
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            if method == "GET":
+                response = client.get(path, headers=headers)
+            else:
+                response = client.post(path, data, content_type="application/json", headers=headers)
+        body = response.json() if response.get("Content-Type", "").startswith("application/json") else None
+        return response.status_code, body, queries
+
+
+class HTTPTarget:
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+
+    def request(self, method, path, data=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.url + path, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, content = e.code, e.read()
+        try:
+            return status, json.loads(content), None
+        except ValueError:
+            return status, None, None
+
+
+def user_id(access):
+    payload = access.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["user_id"]
+
+
+class Scenarios:
+    """Builds one callable per endpoint; each returns ``(status, queries)``."""
+
+    def __init__(self, target):
+        self.target = target
+        self.run_id = uuid.uuid4().hex[:8]
+        self.username = f"bench-{self.run_id}"
+        status, body, _ = target.request("POST", "/auth/register/", {
+            "username": self.username, "email": f"{self.username}@example.com", "password": PASSWORD,
+        })
+        if status != 201:
+            sys.exit(f"Could not register the benchmark user: {status} {body}")
+        self.tokens = self.login()
+        self.counter = iter(range(sys.maxsize))
+        self._local = threading.local()
+
+    def login(self):
+        status, body, _ = self.target.request("POST", "/auth/login/", {"username": self.username, "password": PASSWORD})
+        if status != 200:
+            sys.exit(f"Could not log in the benchmark user: {status} {body}")
+        return body
+
+    def call_login(self):
+        status, _, queries = self.target.request(
+            "POST", "/auth/login/", {"username": self.username, "password": PASSWORD}
+        )
+        return status, queries
+
+    def call_refresh(self):
+        # Rotated refresh tokens are single use: every thread follows its own chain.
+        if getattr(self._local, "refresh", None) is None:
+            self._local.refresh = self.login()["refresh"]
+        status, body, queries = self.target.request("POST", "/auth/refresh/", {"refresh": self._local.refresh})
+        self._local.refresh = body.get("refresh", self._local.refresh) if status == 200 else None
+        return status, queries
+
+    def call_check(self):
+        status, _, queries = self.target.request("GET", "/auth/check/", token=self.tokens["access"])
+        return status, queries
+
+    def call_register(self):
+        username = f"{self.username}-{next(self.counter)}"
+        status, _, queries = self.target.request("POST", "/auth/register/", {
+            "username": username, "email": f"{username}@example.com", "password": PASSWORD,
+        })
+        return status, queries
+
+    def call_profile(self):
+        access = self.tokens["access"]
+        status, _, queries = self.target.request("GET", f"/profile/{user_id(access)}/", token=access)
+        return status, queries
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_endpoint(call, requests, concurrency):
+    latencies, statuses, queries = [], [], []
+    lock = threading.Lock()
+
+    def worker(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            status, query_count = call()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses.append(status)
+                if query_count is not None:
+                    queries.append(query_count)
+
+    shares = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker, share) for share in shares if share]:
+            future.result()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(not 200 <= status < 300 for status in statuses),
+        "requests_per_second": len(latencies) / wall,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "queries_per_request": statistics.fmean(queries) if queries else None,
+    }
+
+
+def compare(results, baseline, threshold, min_p99_delta_ms):
+    """Print the relative changes and return the regressions found."""
+    regressions = []
+    print(f"\ncompared with baseline (threshold {threshold:.0%}):")
+    for name, current in results["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if base is None:
+            print(f"  {name:<10} no baseline")
+            continue
+        rps = current["requests_per_second"] / base["requests_per_second"] - 1
+        p99 = current["p99_ms"] / base["p99_ms"] - 1
+        problems = []
+        if rps < -threshold:
+            problems.append(f"requests/s {rps:+.1%}")
+        if p99 > threshold and current["p99_ms"] - base["p99_ms"] >= min_p99_delta_ms:
+            problems.append(f"p99 {p99:+.1%}")
+        # Averages move a little with cache misses; flag an extra query in at
+        # least every other request.
+        if None not in (current["queries_per_request"], base["queries_per_request"]) \
+                and current["queries_per_request"] - base["queries_per_request"] >= 0.5:
+            problems.append(f"queries {base['queries_per_request']:.2f} -> {current['queries_per_request']:.2f}")
+        if current["errors"] > base["errors"]:
+            problems.append(f"errors {base['errors']} -> {current['errors']}")
+        status = "REGRESSION " + ", ".join(problems) if problems else "ok"
+        print(f"  {name:<10} requests/s {rps:+7.1%}  p99 {p99:+7.1%}  {status}")
+        regressions.extend(f"{name}: {problem}" for problem in problems)
+    return regressions
+
+
+def main():
+    args = parse_args()
+    in_process = not args.url
+
+    if in_process:
+        # Benchmark the endpoints, not the throttles.
+        for name in ("LOGIN_IP", "LOGIN_USERNAME", "REGISTER_IP", "REGISTER_USERNAME"):
+            os.environ[f"AUTH_{name}_RATE"] = UNLIMITED
+        if args.pbkdf2_iterations:
+            os.environ["AUTH_PBKDF2_ITERATIONS"] = str(args.pbkdf2_iterations)
+
+    from common import test_database
+
+    import django
+    from django.conf import settings
+
+    results = {
+        "meta": {
+            "mode": "in-process" if in_process else args.url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "endpoints": {},
+    }
+
+    def run():
+        scenarios = Scenarios(InProcessTarget() if in_process else HTTPTarget(args.url))
+        print(f"{'endpoint':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'queries':>8}")
+        for name in args.endpoints:
+            result = run_endpoint(getattr(scenarios, f"call_{name}"), args.requests, args.concurrency)
+            results["endpoints"][name] = result
+            queries = result["queries_per_request"]
+            print(
+                f"{name:<10} {result['requests_per_second']:9.1f} {result['p50_ms']:9.2f} "
+                f"{result['p95_ms']:9.2f} {result['p99_ms']:9.2f} {result['errors']:7d} "
+                f"{'-' if queries is None else f'{queries:.2f}':>8}"
+            )
+
+    if in_process:
+        sqlite = settings.DATABASES["default"]["ENGINE"].endswith("sqlite3")
+        with tempfile.TemporaryDirectory() as tmp:
+            # A file, so that the client threads can share the test database.
+            with test_database(os.path.join(tmp, "loadtest.sqlite3") if sqlite else None):
+                run()
+    else:
+        run()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_p99_delta_ms)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework.test import APIClient
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from auth_app.cache import user_cache
+from auth_app.clients import client_tokens
+from auth_app.revocation import token_versions
+from auth_app.throttling import local_store
+
+# A second, separate SQLite database playing a read replica for the tests of
+# auth_app.routers. Only tests that ask for it and enable the router use it.
+settings.DATABASES["replica"] = connections.configure_settings({
+    "default": settings.DATABASES["default"],
+    "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+})["replica"]
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    # Test databases are rolled back without firing post_delete, so cached
+    # rows would otherwise leak between tests.
+    user_cache.clear()
+    token_versions.clear()
+    client_tokens.clear()
+    yield
+    user_cache.clear()
+    token_versions.clear()
+    client_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_throttles():
+    local_store.clear()
+    yield
+    local_store.clear()
+
+
+@pytest.fixture
+def fast_hashing(settings):
+    # A low PBKDF2 work factor for tests that hash many passwords.
+    settings.AUTH_PBKDF2_ITERATIONS = 1000
+
+
+@pytest.fixture
+def admin_api_client():
+    """``APIClient`` authenticated as a superuser who joined on 2024-01-01."""
+    admin = get_user_model().objects.create(
+        username="admin", email="admin@example.com", is_staff=True, is_superuser=True,
+        date_joined=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
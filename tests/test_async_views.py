@@ -0,0 +1,121 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+
+from auth_app import async_views
+from auth_app.tokens import AccessToken, RefreshToken
+
+User = get_user_model()
+factory = AsyncRequestFactory()
+
+
+def post(view, data):
+    request = factory.post('/', json.dumps(data), content_type='application/json')
+    response = async_to_sync(view)(request)
+    return response, json.loads(response.content)
+
+
+@pytest.mark.django_db
+def test_async_login():
+    User.objects.create_user(username="testuser", password="securepassword123")
+
+    response, data = post(async_views.login, {"username": "testuser", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    assert RefreshToken(data["refresh"])["user_id"] == User.objects.get().id
+    assert "access" in data
+
+
+@pytest.mark.django_db
+def test_async_login_by_email_ignoring_case():
+    user = User.objects.create_user(username="testuser", email="testuser@example.com", password="securepassword123")
+
+    response, data = post(async_views.login, {"username": "TestUser@Example.com", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    assert RefreshToken(data["refresh"])["user_id"] == user.id
+
+
+@pytest.mark.django_db
+def test_async_login_errors_match_drf():
+    User.objects.create_user(username="testuser", password="securepassword123")
+    User.objects.create_user(username="inactive", email="inactive@example.com", password="securepassword123", is_active=False)
+
+    for credentials in (
+        {"username": "testuser", "password": "wrongpassword123"},
+        {"username": "nonexistentuser", "password": "somepassword"},
+        {"username": "inactive", "password": "securepassword123"},
+    ):
+        response, data = post(async_views.login, credentials)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert data == {"detail": "No active account found with the given credentials"}
+        assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    response, data = post(async_views.login, {"username": "testuser"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert data == {"password": ["This field is required."]}
+
+    response, data = post(async_views.login, {"username": "testuser", "password": ["securepassword123"]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert data == {"password": ["Not a valid string."]}
+
+
+@pytest.mark.django_db
+def test_async_login_accepts_numeric_password_like_drf():
+    User.objects.create_user(username="testuser", password="12345678")
+
+    response, data = post(async_views.login, {"username": "testuser", "password": 12345678})
+    assert response.status_code == status.HTTP_200_OK
+
+    response, data = post(async_views.login, {"username": "testuser", "password": 87654321})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_async_refresh_rotates_and_revokes():
+    user = User.objects.create_user(username="testuser", password="securepassword123")
+    refresh_token = str(RefreshToken.for_user(user))
+
+    response, data = post(async_views.refresh, {"refresh": refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+    assert "access" in data and "refresh" in data
+
+    response, data = post(async_views.refresh, {"refresh": refresh_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response, data = post(async_views.refresh, {"refresh": "invalidtoken123"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert data["detail"] == "Token is invalid or expired"
+
+
+@pytest.mark.django_db
+def test_async_refresh_takes_claims_from_the_user_row():
+    user = User.objects.create_user(username="admin", password="securepassword123", is_superuser=True, role="admin")
+    refresh_token = str(RefreshToken.for_user(user))
+
+    User.objects.filter(pk=user.pk).update(is_superuser=False, role="user")
+    response, data = post(async_views.refresh, {"refresh": refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+    for token in (AccessToken(data["access"]), RefreshToken(data["refresh"])):
+        assert token["is_superuser"] is False
+        assert token["role"] == "user"
+
+
+@pytest.mark.django_db
+def test_async_check_login():
+    user = User.objects.create_user(username="testuser", password="securepassword123")
+    access_token = RefreshToken.for_user(user).access_token
+
+    request = factory.get('/', headers={"Authorization": f'Bearer {access_token}'})
+    response = async_to_sync(async_views.check_login)(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert json.loads(response.content) == {"message": "User is authenticated"}
+
+    response = async_to_sync(async_views.check_login)(factory.get('/'))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert json.loads(response.content) == {"detail": "Authentication credentials were not provided."}
+
+    response = async_to_sync(async_views.check_login)(factory.get('/', headers={"Authorization": 'Bearer invalid'}))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
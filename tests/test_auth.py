@@ -20,6 +20,21 @@ def test_register_user():
     assert User.objects.filter(username="testuser").exists()
 
 
+@pytest.mark.django_db
+def test_register_rejects_email_differing_only_in_case():
+    client = APIClient()
+    data = {"username": "foo", "email": "Foo@x.com", "password": "securepassword123"}
+    assert client.post('/auth/register/', data).status_code == status.HTTP_201_CREATED
+
+    data = {"username": "foo2", "email": "foo@X.com", "password": "securepassword123"}
+    response = client.post('/auth/register/', data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'email' in response.data
+
+    response = client.post('/auth/login/', {"username": "foo@x.com", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.django_db
 def test_login_user():
     # Tworzymy użytkownika
@@ -37,6 +52,30 @@ def test_login_user():
     assert "refresh" in response.data
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("login", ["TestUser", "testuser@example.com", "TestUser@Example.COM"])
+def test_login_by_username_or_email_ignoring_case(login):
+    user = User.objects.create_user(username="testuser", email="TestUser@example.com", password="securepassword123")
+
+    client = APIClient()
+    response = client.post('/auth/login/', {"username": login, "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    assert RefreshToken(response.data["refresh"])["user_id"] == user.id
+
+
+@pytest.mark.django_db
+def test_login_prefers_exact_username_and_rejects_ambiguous_logins():
+    exact = User.objects.create_user(username="Alice", email="alice@example.com", password="securepassword123")
+    User.objects.create_user(username="alice", email="other@example.com", password="securepassword123")
+
+    client = APIClient()
+    response = client.post('/auth/login/', {"username": "Alice", "password": "securepassword123"})
+    assert RefreshToken(response.data["refresh"])["user_id"] == exact.id
+
+    response = client.post('/auth/login/', {"username": "ALICE", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 @pytest.mark.django_db
 def test_register_user_invalid_data():
     client = APIClient()
@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def boot_profile(*args):
+    stdout = StringIO()
+    call_command("boot_profile", "--repeat", "1", "--top", "3", *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+def test_boot_profile_reports_phases_and_imports():
+    output = boot_profile()
+
+    assert "GET /auth/check/ -> 401" in output
+    for phase in ("settings", "apps", "middleware", "urls", "first request", "second request"):
+        assert f"  {phase} " in output
+    assert "Import time by package" in output
+    assert "Slowest imports" in output
+
+
+@pytest.mark.parametrize("args, status", [((), 200), (("--api-only",), 404)])
+def test_api_only_mode_drops_the_admin(args, status):
+    output = boot_profile("--path", "/admin/login/", *args)
+
+    assert f"GET /admin/login/ -> {status}" in output
+
+
+def test_api_only_mode_serves_the_api():
+    output = boot_profile("--api-only", "--path", "/auth/.well-known/jwks.json")
+
+    assert "API-only mode" in output
+    assert "-> 200" in output
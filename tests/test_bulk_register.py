@@ -0,0 +1,79 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+pytestmark = pytest.mark.usefixtures("fast_hashing")
+
+
+@pytest.mark.django_db
+def test_bulk_register_reports_per_item_results(admin_api_client):
+    CustomUser.objects.create(username="existing", email="existing@example.com")
+
+    response = admin_api_client.post('/auth/register/bulk/', {"users": [
+        {"username": "alice", "email": "alice@example.com", "password": "securepassword123", "role": "editor"},
+        {"username": "existing", "email": "new@example.com", "password": "securepassword123"},
+        {"username": "bob", "email": "ALICE@example.com", "password": "securepassword123"},
+        {"username": "carol", "email": "carol@example.com", "password": "short"},
+        {"username": "dave", "email": "dave@example.com", "password": "securepassword123"},
+    ]}, format='json')
+
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    assert response.data["created"] == 2
+    results = response.data["results"]
+    assert [result["status"] for result in results] == ["created", "error", "error", "error", "created"]
+    assert "username" in results[1]["errors"]
+    assert "email" in results[2]["errors"]
+    assert "password" in results[3]["errors"]
+
+    alice = CustomUser.objects.get(pk=results[0]["id"])
+    assert alice.username == "alice"
+    assert alice.role == "editor"
+    assert alice.check_password("securepassword123")
+
+
+@pytest.mark.django_db
+def test_bulk_register_rejects_invalid_roles(admin_api_client):
+    response = admin_api_client.post('/auth/register/bulk/', {"users": [
+        {"username": "alice", "email": "alice@example.com", "password": "securepassword123", "role": ["admin"]},
+        {"username": "bob", "email": "bob@example.com", "password": "securepassword123", "role": "x" * 300},
+        {"username": "carol", "email": "carol@example.com", "password": "securepassword123", "role": "admin"},
+        {"username": "dave", "email": "dave@example.com", "password": "securepassword123"},
+    ]}, format='json')
+
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    results = response.data["results"]
+    assert [result["status"] for result in results] == ["error", "error", "error", "created"]
+    assert all("role" in result["errors"] for result in results[:3])
+    assert list(CustomUser.objects.exclude(username="admin").values_list("username", "role")) == [("dave", "user")]
+
+
+@pytest.mark.django_db
+def test_bulk_register_query_count_does_not_grow_with_batch(admin_api_client, django_assert_max_num_queries):
+    users = [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": "securepassword123"}
+        for i in range(50)
+    ]
+    with django_assert_max_num_queries(5):
+        response = admin_api_client.post('/auth/register/bulk/', {"users": users}, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert CustomUser.objects.filter(username__startswith="user").count() == 50
+
+
+@pytest.mark.django_db
+def test_bulk_register_requires_admin():
+    user = CustomUser.objects.create(username="testuser", email=fake.email())
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.post('/auth/register/bulk/', {"users": [
+        {"username": "alice", "email": "alice@example.com", "password": "securepassword123"},
+    ]}, format='json')
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not CustomUser.objects.filter(username="alice").exists()
@@ -0,0 +1,106 @@
+import base64
+from io import StringIO
+
+import pytest
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from django.core.management import CommandError, call_command
+from django.test import Client
+
+from auth_app.clients import client_tokens
+from auth_app.models import ServiceClient
+from auth_app.tokens import AccessToken, ServiceToken
+
+
+def create_client(client_id="calendar", scopes="calendar.read email.send", *args):
+    stdout = StringIO()
+    call_command("create_service_client", client_id, "--scopes", scopes, *args, stdout=stdout)
+    return dict(line.split(": ", 1) for line in stdout.getvalue().splitlines())["client_secret"]
+
+
+def request_token(client_id, secret, **data):
+    return Client().post('/auth/token/', {
+        "grant_type": "client_credentials", "client_id": client_id, "client_secret": secret, **data,
+    })
+
+
+@pytest.mark.django_db
+def test_client_credentials_grant_caches_tokens(django_assert_num_queries):
+    secret = create_client()
+    assert ServiceClient.objects.get().secret_hash != secret
+
+    response = request_token("calendar", secret)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Cache-Control"] == "no-store"
+    data = response.json()
+    assert data["token_type"] == "Bearer"
+    assert data["scope"] == "calendar.read email.send"
+    assert 0 < data["expires_in"] <= 900
+    token = ServiceToken(data["access_token"])
+    assert token["client_id"] == "calendar"
+    with pytest.raises(TokenError):
+        AccessToken(data["access_token"])
+
+    with django_assert_num_queries(0):
+        again = request_token("calendar", secret)
+    assert again.json()["access_token"] == data["access_token"]
+
+
+@pytest.mark.django_db
+def test_client_credentials_grant_errors():
+    secret = create_client()
+    basic = base64.b64encode(f"calendar:{secret}".encode()).decode()
+    client = Client()
+
+    response = client.post('/auth/token/', {"grant_type": "client_credentials", "scope": "email.send"},
+                           HTTP_AUTHORIZATION=f"Basic {basic}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["scope"] == "email.send"
+
+    response = request_token("calendar", secret, scope="admin")
+    assert (response.status_code, response.json()) == (status.HTTP_400_BAD_REQUEST, {"error": "invalid_scope"})
+    response = request_token("calendar", secret, grant_type="password")
+    assert (response.status_code, response.json()) == (status.HTTP_400_BAD_REQUEST, {"error": "unsupported_grant_type"})
+    response = request_token("calendar", "wrong-secret")
+    assert (response.status_code, response.json()) == (status.HTTP_401_UNAUTHORIZED, {"error": "invalid_client"})
+    response = client.post('/auth/token/', {"grant_type": "client_credentials"}, HTTP_AUTHORIZATION="Basic bm9wZTpub3Bl")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["WWW-Authenticate"] == 'Basic realm="api"'
+
+
+@pytest.mark.django_db
+def test_tokens_are_reissued_near_expiry_and_after_changes(settings):
+    secret = create_client()
+    first = request_token("calendar", secret).json()["access_token"]
+
+    settings.AUTH_SERVICE_TOKEN_REFRESH_MARGIN = settings.AUTH_SERVICE_TOKEN_LIFETIME
+    second = request_token("calendar", secret).json()["access_token"]
+    assert second != first
+
+    client = ServiceClient.objects.get()
+    client.is_active = False
+    client.save()
+    assert request_token("calendar", secret).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_create_service_client_rotates_secrets():
+    old_secret = create_client()
+    with pytest.raises(CommandError):
+        create_client()
+
+    new_secret = create_client("calendar", "", "--rotate-secret")
+    assert request_token("calendar", old_secret).status_code == status.HTTP_401_UNAUTHORIZED
+    response = request_token("calendar", new_secret)
+    assert response.json()["scope"] == "calendar.read email.send"
+
+
+@pytest.mark.django_db
+def test_client_cache_has_its_own_ttl(settings, django_assert_num_queries):
+    create_client()
+    settings.AUTH_USER_CACHE_TTL = 3600
+    settings.AUTH_SERVICE_CLIENT_CACHE_TTL = 0
+
+    with django_assert_num_queries(2):
+        client_tokens.get_client("calendar")
+        client_tokens.get_client("calendar")
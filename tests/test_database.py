@@ -0,0 +1,26 @@
+import pytest
+from django.db import connection
+
+from tsk_auth_service.settings import tune_database
+
+
+@pytest.mark.django_db
+def test_sqlite_connection_is_tuned():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == 20000
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+    assert connection.transaction_mode == "IMMEDIATE"
+    assert connection.settings_dict["CONN_HEALTH_CHECKS"]
+
+
+def test_postgres_uses_a_pool(monkeypatch):
+    config = tune_database({"ENGINE": "django.db.backends.postgresql", "NAME": "auth"})
+    assert config["OPTIONS"]["pool"]["max_size"] == 10
+    assert config["CONN_MAX_AGE"] == 0
+
+    monkeypatch.setenv("DB_POOL", "false")
+    config = tune_database({"ENGINE": "django.db.backends.postgresql", "NAME": "auth"})
+    assert "pool" not in config["OPTIONS"]
+    assert config["CONN_MAX_AGE"] == 600
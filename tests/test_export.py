@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+CustomUser = get_user_model()
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_streams_ndjson(admin_api_client):
+    CustomUser.objects.create(
+        username="editor", email="editor@example.com", role="editor",
+        date_joined=datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc),
+    )
+
+    response = admin_api_client.get('/profile/export/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in content(response).splitlines()]
+    assert [row["username"] for row in rows] == ["admin", "editor"]
+    assert rows[1] == {
+        "id": rows[1]["id"],
+        "username": "editor",
+        "email": "editor@example.com",
+        "role": "editor",
+        "date_joined": "2024-06-01T12:30:00Z",
+    }
+
+
+@pytest.mark.django_db
+def test_export_csv_since(admin_api_client):
+    CustomUser.objects.create(
+        username="newuser", email="newuser@example.com",
+        date_joined=datetime(2024, 6, 1, tzinfo=timezone.utc),
+    )
+
+    response = admin_api_client.get('/profile/export/', {"output": "csv", "since": "2024-06-01"})
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.reader(io.StringIO(content(response))))
+    assert rows[0] == ["id", "username", "email", "role", "date_joined"]
+    assert [row[1] for row in rows[1:]] == ["newuser"]
+
+
+@pytest.mark.django_db
+def test_export_validates_parameters(admin_api_client):
+    assert admin_api_client.get('/profile/export/', {"output": "xml"}).status_code == status.HTTP_400_BAD_REQUEST
+    assert admin_api_client.get('/profile/export/', {"since": "yesterday"}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_export_requires_admin():
+    client = APIClient()
+    client.force_authenticate(CustomUser.objects.create(username="testuser", email="test@example.com"))
+    assert client.get('/profile/export/').status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,52 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from auth_app.tokens import RefreshToken
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("stateless", [False, True])
+def test_gateway_returns_user_headers(settings, stateless):
+    settings.AUTH_STATELESS_TOKENS = stateless
+    user = CustomUser.objects.create(username="editor", email=fake.email(), role="editor")
+    token = RefreshToken.for_user(user).access_token
+
+    response = Client().get('/auth/gateway/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b""
+    assert response["X-Auth-User-Id"] == str(user.pk)
+    assert response["X-Auth-User-Role"] == "editor"
+
+
+@pytest.mark.django_db
+def test_gateway_rejects_missing_and_invalid_tokens():
+    user = CustomUser.objects.create(username="testuser", email=fake.email(), is_active=False)
+    client = Client()
+
+    for headers in ({}, {"HTTP_AUTHORIZATION": "Bearer invalid"},
+                    {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}):
+        response = client.get('/auth/gateway/', **headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.content == b""
+        assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+        assert "X-Auth-User-Id" not in response
+
+
+@pytest.mark.django_db
+def test_gateway_checks_expiry_of_remembered_tokens(monkeypatch):
+    user = CustomUser.objects.create(username="testuser", email=fake.email())
+    token = RefreshToken.for_user(user).access_token
+    client = Client()
+    assert client.get('/auth/gateway/', HTTP_AUTHORIZATION=f'Bearer {token}').status_code == status.HTTP_200_OK
+
+    expired = datetime_from_epoch(token["exp"] + 1)
+    monkeypatch.setattr("auth_app.authentication.aware_utcnow", lambda: expired)
+    response = client.get('/auth/gateway/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
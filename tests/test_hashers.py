@@ -0,0 +1,79 @@
+import time
+from io import StringIO
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.core.management import call_command
+
+from auth_app.hashing import _rehash, hash_pool, needs_rehash
+
+User = get_user_model()
+
+
+def wait_for_pool():
+    deadline = time.monotonic() + 30
+    while hash_pool.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def iterations(user):
+    user.refresh_from_db()
+    return identify_hasher(user.password).decode(user.password)["iterations"]
+
+
+def test_work_factor_follows_setting(settings):
+    settings.AUTH_PBKDF2_ITERATIONS = 1000
+    hasher = identify_hasher("pbkdf2_sha256$1000$salt$hash")
+    assert hasher.iterations == 1000
+    encoded = hasher.encode("password", hasher.salt())
+    assert not needs_rehash(encoded)
+
+    settings.AUTH_PBKDF2_ITERATIONS = 2000
+    assert needs_rehash(encoded)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_rehashes_in_background(settings):
+    settings.AUTH_PBKDF2_ITERATIONS = 1000
+    user = User.objects.create_user(username="testuser", password="securepassword123")
+
+    settings.AUTH_PBKDF2_ITERATIONS = 2000
+    response = APIClient().post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+
+    wait_for_pool()
+    assert iterations(user) == 2000
+    assert user.check_password("securepassword123")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rehash_does_not_overwrite_concurrent_change(settings):
+    settings.AUTH_PBKDF2_ITERATIONS = 1000
+    user = User.objects.create_user(username="testuser", password="securepassword123")
+    verified = user.password
+    user.set_password("newpassword123")
+    user.save()
+
+    settings.AUTH_PBKDF2_ITERATIONS = 2000
+    _rehash(user.pk, "securepassword123", verified)
+    user.refresh_from_db()
+    assert user.check_password("newpassword123")
+
+
+def test_calibrate_hashers(settings):
+    settings.AUTH_PBKDF2_ITERATIONS = 10000
+    settings.PASSWORD_HASHERS = [
+        "auth_app.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.Argon2PasswordHasher",
+    ]
+    out = StringIO()
+    call_command("calibrate_hashers", "--samples", "3", "--target-ms", "100", stdout=out)
+
+    output = out.getvalue()
+    assert "PBKDF2PasswordHasher" in output
+    assert "p50" in output and "p99" in output
+    assert "logins/s" in output
+    assert "iterations=" in output and "AUTH_PBKDF2_ITERATIONS" in output
@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app import hashing
+from auth_app.hashing import HashingPool, HashingPoolSaturated, hash_pool
+
+User = get_user_model()
+
+
+@pytest.fixture
+def saturated_pool():
+    slots = []
+    while hash_pool._slots.acquire(blocking=False):
+        slots.append(None)
+    yield
+    for _ in slots:
+        hash_pool._slots.release()
+
+
+def test_pool_rejects_when_queue_is_full():
+    pool = HashingPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running = [pool.submit(release.wait), pool.submit(release.wait)]
+
+    with pytest.raises(HashingPoolSaturated):
+        pool.submit(release.wait)
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 2
+    assert stats["queue_depth"] == 1
+    assert stats["rejected"] == 1
+
+    release.set()
+    for future in running:
+        future.result()
+    assert pool.submit(len, "x").result() == 1
+    assert pool.stats()["completed"] == 3
+
+
+def test_bulk_hashing_leaves_room_for_logins(monkeypatch):
+    pool = HashingPool(workers=2, max_queue=0)
+    monkeypatch.setattr(hashing, "hash_pool", pool)
+    started, release = threading.Event(), threading.Event()
+
+    def make_password(password):
+        started.set()
+        release.wait()
+        return f"hash:{password}"
+
+    monkeypatch.setattr(hashing.hashers, "make_password", make_password)
+    result = []
+    batch = threading.Thread(target=lambda: result.extend(hashing.make_passwords(["a", "b", "c"])))
+    batch.start()
+    started.wait()
+
+    # One hash of the batch at a time; the other worker serves a login.
+    assert pool.stats()["in_flight"] == 1
+    assert pool.submit(len, "x").result(timeout=5) == 1
+
+    release.set()
+    batch.join()
+    assert result == ["hash:a", "hash:b", "hash:c"]
+    assert pool.stats()["rejected"] == 0
+
+
+@pytest.mark.django_db
+def test_login_hashes_on_pool():
+    User.objects.create_user(username="testuser", password="securepassword123")
+    before = hash_pool.stats()["completed"]
+
+    response = APIClient().post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    assert hash_pool.stats()["completed"] == before + 1
+
+
+@pytest.mark.django_db
+def test_saturated_pool_returns_503(saturated_pool):
+    User.objects.create_user(username="testuser", password="securepassword123")
+    client = APIClient()
+
+    response = client.post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "1"
+
+    data = {"username": "newuser", "email": "newuser@example.com", "password": "securepassword123"}
+    response = client.post('/auth/register/', data)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert not User.objects.filter(username="newuser").exists()
+
+
+@pytest.mark.django_db
+def test_profile_update_hashes_password():
+    user = User.objects.create_user(username="testuser", email="testuser@example.com", password="oldpassword123")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.patch(f'/profile/{user.id}/', {"password": "newpassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert user.check_password("newpassword123")
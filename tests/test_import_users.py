@@ -0,0 +1,97 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+
+User = get_user_model()
+
+
+def run_import(path, **options):
+    stdout, stderr = StringIO(), StringIO()
+    call_command("import_users", str(path), stdout=stdout, stderr=stderr, **options)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_csv_hashes_and_reports_duplicates(tmp_path, fast_hashing):
+    User.objects.create_user(username="existing", email="existing@example.com", password="password123")
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "username,email,password,role\n"
+        "alice,alice@example.com,alicepassword,editor\n"
+        "existing,new@example.com,password123,\n"
+        "bob,alice@example.com,bobpassword,\n"
+        "carol,not-an-email,carolpassword,\n"
+        "dave,dave@example.com,davepassword,\n"
+    )
+
+    stdout, stderr = run_import(path, workers=1, chunk_size=2)
+
+    assert "Imported 2 users, skipped 3 rows" in stdout
+    assert "line 3 (existing): username:" in stderr
+    assert "line 4 (bob): email:" in stderr
+    assert "line 5 (carol): email:" in stderr
+    alice = User.objects.get(username="alice")
+    assert alice.role == "editor"
+    assert alice.check_password("alicepassword")
+    assert User.objects.get(username="dave").role == "user"
+
+
+@pytest.mark.django_db
+def test_import_rejects_invalid_roles_and_overlong_emails(tmp_path, fast_hashing):
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in [
+        {"username": "alice", "email": "alice@example.com", "password": "alicepassword", "role": ["editor"]},
+        {"username": "bob", "email": "bob@example.com", "password": "bobpassword", "role": "x" * 300},
+        {"username": "carol", "email": "carol@example.com", "password": "carolpassword", "role": "superadmin"},
+        {"username": "dave", "email": f"{'d' * 64}@{'e' * 63}.{'f' * 63}.{'g' * 63}.com", "password": "davepassword"},
+        {"username": "erin", "email": "erin@example.com", "password": "erinpassword", "role": "editor"},
+    ]))
+
+    stdout, stderr = run_import(path, workers=1)
+
+    assert "Imported 1 users, skipped 4 rows" in stdout
+    assert "line 1 (alice): role: Choose one of: user, editor." in stderr
+    assert "line 2 (bob): role:" in stderr
+    assert "line 3 (carol): role:" in stderr
+    assert "line 4 (dave): email:" in stderr
+    assert User.objects.get().username == "erin"
+
+
+@pytest.mark.django_db
+def test_import_jsonl_with_pre_hashed_passwords(tmp_path, fast_hashing):
+    encoded = make_password("legacypassword")
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"username": "alice", "email": "alice@example.com", "password_hash": encoded}),
+        "not json",
+        json.dumps({"username": "bob", "email": "bob@example.com", "password_hash": "md4$unknown"}),
+    ]))
+
+    stdout, stderr = run_import(path)
+
+    assert "Imported 1 users, skipped 2 rows" in stdout
+    assert "line 2 (-): non_field_errors: Invalid JSON" in stderr
+    assert "line 3 (bob): password_hash:" in stderr
+    assert User.objects.get(username="alice").password == encoded
+
+
+@pytest.mark.django_db
+def test_import_resumes_from_checkpoint(tmp_path, fast_hashing):
+    path = tmp_path / "users.csv"
+    checkpoint = tmp_path / "users.checkpoint"
+    path.write_text(
+        "username,email,password\n"
+        + "".join(f"user{i},user{i}@example.com,password{i}\n" for i in range(5))
+    )
+    checkpoint.write_text("3")
+
+    stdout, stderr = run_import(path, workers=1, chunk_size=2, checkpoint=str(checkpoint))
+
+    assert "Resuming after line 3" in stdout
+    assert sorted(User.objects.values_list("username", flat=True)) == ["user2", "user3", "user4"]
+    assert checkpoint.read_text() == "6"
+    assert stderr == ""
@@ -0,0 +1,94 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app.models import ServiceClient
+from auth_app.serializers import TokenIntrospectionSerializer
+from auth_app.throttling import CallerRateThrottle
+from auth_app.tokens import RefreshToken, ServiceToken
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+def service_client(scopes="auth.introspect"):
+    client = ServiceClient.objects.create(client_id="calendar", secret_hash="-", scopes=scopes)
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {ServiceToken.for_client(client, client.scope_set)}')
+    return api_client
+
+
+@pytest.mark.django_db
+def test_introspect_batch(django_assert_num_queries):
+    editor = CustomUser.objects.create(username="editor", email=fake.email(), role="editor")
+    normal_user = CustomUser.objects.create(username="normaluser", email=fake.email())
+    inactive_user = CustomUser.objects.create(username="inactive", email=fake.email(), is_active=False)
+
+    editor_access = RefreshToken.for_user(editor).access_token
+    tokens = [
+        str(editor_access),
+        str(RefreshToken.for_user(normal_user).access_token),
+        str(RefreshToken.for_user(inactive_user).access_token),
+        str(RefreshToken.for_user(normal_user)),  # refresh token, wrong type
+        "invalidtoken123",
+        str(editor_access),
+    ]
+
+    client = service_client()
+    # The service client row, then the users.
+    with django_assert_num_queries(2):
+        response = client.post('/auth/introspect/', {"tokens": tokens}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.data["results"]
+    assert results[0] == {"active": True, "exp": editor_access["exp"], "user_id": editor.id, "role": "editor"}
+    assert results[1]["active"] is True
+    assert results[1]["role"] == "user"
+    assert results[2] == {"active": False}
+    assert results[3] == {"active": False}
+    assert results[4] == {"active": False}
+    assert results[5] == results[0]
+
+
+@pytest.mark.django_db
+def test_introspect_rejects_oversized_batch():
+    client = service_client()
+    tokens = ["token"] * (TokenIntrospectionSerializer.MAX_TOKENS + 1)
+    response = client.post('/auth/introspect/', {"tokens": tokens}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'tokens' in response.data
+
+    response = client.post('/auth/introspect/', {"tokens": []}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_introspect_requires_a_service_client_or_admin():
+    user = CustomUser.objects.create(username="normaluser", email=fake.email())
+    admin = CustomUser.objects.create(username="admin", email=fake.email(), is_superuser=True)
+    data = {"tokens": [str(RefreshToken.for_user(user).access_token)]}
+
+    response = APIClient().post('/auth/introspect/', data, format='json')
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    assert client.post('/auth/introspect/', data, format='json').status_code == status.HTTP_403_FORBIDDEN
+
+    response = service_client(scopes="calendar.read").post('/auth/introspect/', data, format='json')
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(admin).access_token}')
+    response = client.post('/auth/introspect/', data, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["active"] is True
+
+
+@pytest.mark.django_db
+def test_introspect_is_throttled_per_caller(monkeypatch):
+    monkeypatch.setitem(CallerRateThrottle.THROTTLE_RATES, 'introspect_caller', '2/min')
+    client = service_client()
+    statuses = [client.post('/auth/introspect/', {"tokens": ["token"]}, format='json').status_code for _ in range(3)]
+    assert statuses == [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS]
@@ -0,0 +1,110 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app.keys import get_token_backend
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+def private_pem(key):
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def public_pem(key):
+    return key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+
+@pytest.fixture
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def ed_key():
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def login(client):
+    CustomUser.objects.create_user(username="testuser", password="securepassword123", email=fake.email())
+    response = client.post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+@pytest.mark.django_db
+def test_tokens_are_signed_with_active_key(settings, rsa_key):
+    settings.AUTH_JWT_KEYS = [{"kid": "2025-01", "algorithm": "RS256", "private_key": private_pem(rsa_key)}]
+    client = APIClient()
+    tokens = login(client)
+
+    header = jwt.get_unverified_header(tokens["access"])
+    assert header == {"alg": "RS256", "kid": "2025-01", "typ": "JWT"}
+
+    # Verifiable with nothing but the public key, as a downstream service would.
+    payload = jwt.decode(tokens["access"], public_pem(rsa_key), algorithms=["RS256"])
+    assert payload["token_type"] == "access"
+
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+    assert client.get('/auth/check/').status_code == status.HTTP_200_OK
+    assert client.post('/auth/refresh/', {"refresh": tokens["refresh"]}).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_rotated_keys_overlap(settings, rsa_key, ed_key):
+    settings.AUTH_JWT_KEYS = [{"kid": "old", "algorithm": "RS256", "private_key": private_pem(rsa_key)}]
+    old_token = get_token_backend().encode({"sub": "1"})
+
+    # New EdDSA key signs; the old key is kept for verification only.
+    settings.AUTH_JWT_KEYS = [
+        {"kid": "new", "algorithm": "EdDSA", "private_key": private_pem(ed_key)},
+        {"kid": "old", "algorithm": "RS256", "public_key": public_pem(rsa_key)},
+    ]
+    backend = get_token_backend()
+    new_token = backend.encode({"sub": "2"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert backend.decode(old_token)["sub"] == "1"
+    assert backend.decode(new_token)["sub"] == "2"
+
+
+@pytest.mark.django_db
+def test_unknown_kid_is_rejected(settings, rsa_key):
+    settings.AUTH_JWT_KEYS = [{"kid": "current", "algorithm": "RS256", "private_key": private_pem(rsa_key)}]
+    forged = jwt.encode({"token_type": "access"}, private_pem(rsa_key), algorithm="RS256", headers={"kid": "other"})
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {forged}')
+    assert client.get('/auth/check/').status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_jwks_document(settings, rsa_key, ed_key):
+    settings.AUTH_JWT_KEYS = [
+        {"kid": "new", "algorithm": "EdDSA", "private_key": private_pem(ed_key)},
+        {"kid": "old", "algorithm": "RS256", "public_key": public_pem(rsa_key)},
+    ]
+    response = APIClient().get('/auth/.well-known/jwks.json')
+    assert response.status_code == status.HTTP_200_OK
+    assert "max-age=300" in response["Cache-Control"]
+
+    keys = response.json()["keys"]
+    assert [(key["kid"], key["alg"], key["kty"]) for key in keys] == [("new", "EdDSA", "OKP"), ("old", "RS256", "RSA")]
+    assert "d" not in keys[0] and "d" not in keys[1]  # no private material
+
+
+def test_jwks_is_empty_for_hs256(settings):
+    settings.AUTH_JWT_KEYS = []
+    assert APIClient().get('/auth/.well-known/jwks.json').json() == {"keys": []}
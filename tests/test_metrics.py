@@ -0,0 +1,101 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app.metrics import Registry
+
+CustomUser = get_user_model()
+
+
+@pytest.fixture
+def metrics_token(settings):
+    settings.AUTH_METRICS_TOKEN = "scrape-secret"
+    return "scrape-secret"
+
+
+@pytest.mark.django_db
+def test_metrics_cover_requests_hashing_and_tokens(fast_hashing, metrics_token):
+    CustomUser.objects.create_user(username="testuser", password="securepassword123", email="test@example.com")
+    client = APIClient()
+    assert client.post('/auth/login/', {"username": "testuser", "password": "securepassword123"}).status_code == 200
+
+    response = client.get('/metrics', HTTP_AUTHORIZATION=f"Bearer {metrics_token}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.content.decode()
+    assert 'auth_http_request_duration_seconds_count{route="auth/login/",method="POST",status="200"}' in text
+    assert 'auth_db_queries_per_request_bucket{route="auth/login/",le="+Inf"}' in text
+    assert 'auth_password_hash_seconds_count{operation="check_password"}' in text
+    assert 'auth_token_sign_seconds_count{token_type="access"}' in text
+    assert "auth_user_cache_hits_total" in text
+    assert "# TYPE auth_hashing_in_flight gauge" in text
+    assert "\nauth_hashing_in_flight 0\n" in text
+    assert "\nauth_hashing_queue_depth 0\n" in text
+
+
+@pytest.mark.django_db
+def test_metrics_token(settings):
+    client = APIClient()
+    # Not served at all until a token is configured.
+    assert client.get('/metrics').status_code == status.HTTP_404_NOT_FOUND
+
+    settings.AUTH_METRICS_TOKEN = "scrape-secret"
+    assert client.get('/metrics').status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get('/metrics', HTTP_AUTHORIZATION="Bearer wrong").status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get('/metrics', HTTP_AUTHORIZATION="Bearer scrape-secret").status_code == status.HTTP_200_OK
+
+
+def test_snapshots_of_all_processes_are_merged(settings, tmp_path):
+    settings.AUTH_METRICS_DIR = str(tmp_path)
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc("login/", amount=2)
+    latency.observe(0.05)
+
+    # Another worker process.
+    (tmp_path / f"metrics-{os.getppid()}-worker.json").write_text(json.dumps([
+        ["requests_total", ["login/"], 3],
+        ["latency_seconds", [], [0, 1, 0, 0.5]],
+    ]))
+
+    text = registry.render(registry.collect_all())
+    assert 'requests_total{route="login/"} 5' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_sum 0.55" in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_stale_snapshots(settings, tmp_path):
+    settings.AUTH_METRICS_DIR = str(tmp_path)
+    settings.AUTH_METRICS_FLUSH_SECONDS = 5
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.")
+    in_flight = registry.gauge("in_flight", "Operations in flight.")
+    requests.inc()
+    registry.add_collector(lambda: {(in_flight.name, ()): 1})
+
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead = tmp_path / f"metrics-{int(exited.stdout)}-exited.json"
+    dead.write_text(json.dumps([["requests_total", [], 10], ["in_flight", [], 4]]))
+    # A live but idle worker that last flushed a minute ago.
+    idle = tmp_path / f"metrics-{os.getppid()}-idle.json"
+    idle.write_text(json.dumps([["requests_total", [], 100], ["in_flight", [], 2]]))
+    os.utime(idle, (os.path.getmtime(idle) - 60,) * 2)
+
+    for _ in range(2):
+        text = registry.render(registry.collect_all())
+        # Counters of every process are kept, gauges only from fresh snapshots.
+        assert "\nrequests_total 111\n" in text
+        assert "\nin_flight 1\n" in text
+        # The exited process was folded into the archive.
+        assert not dead.exists()
+    assert (tmp_path / "metrics-archive.json").exists()
@@ -0,0 +1,37 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.test import Client
+
+from auth_app.tokens import RefreshToken
+
+CustomUser = get_user_model()
+
+
+@pytest.mark.django_db
+def test_api_routes_skip_session_and_csrf():
+    user = CustomUser.objects.create(username="testuser", email="test@example.com")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    response = client.get('/auth/check/')
+    assert response.status_code == status.HTTP_200_OK
+    assert not hasattr(response.wsgi_request, "session")
+    assert not hasattr(response.wsgi_request, "_messages")
+
+    # No CSRF token is needed for token-authenticated writes.
+    response = Client(enforce_csrf_checks=True).post('/auth/login/', {"username": "nobody", "password": "wrongpassword123"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_admin_keeps_full_middleware():
+    client = Client(enforce_csrf_checks=True)
+    response = client.get('/admin/login/')
+    assert response.status_code == status.HTTP_200_OK
+    assert hasattr(response.wsgi_request, "session")
+    assert "csrftoken" in response.cookies
+
+    response = client.post('/admin/login/', {"username": "admin", "password": "adminpassword"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
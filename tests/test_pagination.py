@@ -0,0 +1,39 @@
+import pytest
+from rest_framework import status
+from django.contrib.auth import get_user_model
+
+CustomUser = get_user_model()
+
+
+@pytest.mark.django_db
+def test_profile_list_is_cursor_paginated(admin_api_client, django_assert_num_queries):
+    for i in range(6):
+        CustomUser.objects.create(username=f"user{i}", email=f"user{i}@example.com")
+
+    pages, url = [], '/profile/?page_size=3'
+    while url:
+        with django_assert_num_queries(1):
+            response = admin_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 3
+        pages.append(response.data)
+        url = response.data["next"]
+
+    usernames = [user["username"] for page in pages for user in page["results"]]
+    assert usernames == ["admin"] + [f"user{i}" for i in range(6)]
+    assert "count" not in pages[0]
+    assert pages[0]["previous"] is None
+
+    previous = admin_api_client.get(pages[1]["previous"])
+    assert [user["username"] for user in previous.data["results"]] == ["admin", "user0", "user1"]
+
+
+@pytest.mark.django_db
+def test_profile_list_orders_by_username(admin_api_client):
+    for name in ["carol", "alice", "bob"]:
+        CustomUser.objects.create(username=name, email=f"{name}@example.com")
+
+    response = admin_api_client.get('/profile/?ordering=-username&page_size=2')
+    assert [user["username"] for user in response.data["results"]] == ["carol", "bob"]
+    response = admin_api_client.get(response.data["next"])
+    assert [user["username"] for user in response.data["results"]] == ["alice", "admin"]
@@ -0,0 +1,29 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app.serializers import UserReadSerializer, UserSerializer
+
+CustomUser = get_user_model()
+renderer = JSONRenderer()
+
+
+def test_read_serializer_output_is_identical():
+    users = [CustomUser(id=i, username=f"użytkownik{i}", email=f"user{i}@example.com") for i in range(3)]
+    rows = [{"id": u.id, "username": u.username, "email": u.email} for u in users]
+
+    expected = renderer.render(UserSerializer(users, many=True).data)
+    assert renderer.render(UserReadSerializer(users, many=True).data) == expected
+    assert renderer.render(UserReadSerializer(rows, many=True).data) == expected
+    assert renderer.render(UserReadSerializer(users[0]).data) == renderer.render(UserSerializer(users[0]).data)
+
+
+@pytest.mark.django_db
+def test_retrieve_uses_read_serializer():
+    user = CustomUser.objects.create_user(username="testuser", password="securepassword123", email="test@example.com")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.get(f'/profile/{user.id}/')
+    assert response.content == renderer.render(UserSerializer(user).data)
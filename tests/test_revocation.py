@@ -0,0 +1,76 @@
+import time
+import uuid
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app.revocation import BloomFilter, RevocationStore
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_rotated_refresh_token_cannot_be_reused():
+    User.objects.create_user(username="testuser", password="securepassword123")
+    client = APIClient()
+    login_response = client.post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    refresh_token = login_response.data["refresh"]
+
+    first = client.post('/auth/refresh/', {"refresh": refresh_token})
+    assert first.status_code == status.HTTP_200_OK
+    assert first.data["refresh"] != refresh_token
+
+    replay = client.post('/auth/refresh/', {"refresh": refresh_token})
+    assert replay.status_code == status.HTTP_401_UNAUTHORIZED
+
+    rotated = client.post('/auth/refresh/', {"refresh": first.data["refresh"]})
+    assert rotated.status_code == status.HTTP_200_OK
+
+
+def test_revoke_and_check():
+    store = RevocationStore(bucket_seconds=60, bucket_capacity=100)
+    exp = int(time.time()) + 300
+    jti = uuid.uuid4().hex
+
+    assert not store.is_revoked(jti, exp)
+    assert store.revoke(jti, exp)
+    assert store.is_revoked(jti, exp)
+    assert not store.revoke(jti, exp)  # already revoked
+    assert not store.is_revoked(uuid.uuid4().hex, exp)
+
+
+def test_expired_entries_are_pruned():
+    store = RevocationStore(bucket_seconds=60, bucket_capacity=100)
+    now = time.time()
+    for _ in range(1000):
+        store.revoke(uuid.uuid4().hex, int(now) + 30)
+    store.revoke("long-lived", int(now) + 3600)
+    assert len(store) == 1001
+
+    store.prune(now + 600)
+    assert len(store) == 1
+    assert store.is_revoked("long-lived", int(now) + 3600)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    digests = [uuid.uuid4().bytes for _ in range(1000)]
+    for digest in digests:
+        bloom.add(digest)
+
+    assert all(digest in bloom for digest in digests)
+    false_positives = sum(uuid.uuid4().bytes in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_shared_cache_backend():
+    exp = int(time.time()) + 300
+    jti = uuid.uuid4().hex
+    worker_a = RevocationStore(cache_alias="default")
+    worker_b = RevocationStore(cache_alias="default")
+
+    assert worker_a.revoke(jti, exp)
+    assert worker_b.is_revoked(jti, exp)
+    assert not worker_b.revoke(jti, exp)
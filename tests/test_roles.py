@@ -0,0 +1,58 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+
+from auth_app.authentication import ClaimsJWTAuthentication
+from auth_app.roles import RoleTable, get_role_table
+from auth_app.tokens import RefreshToken
+from auth_app.views import SpecialResourceView
+
+CustomUser = get_user_model()
+fake = Faker()
+factory = APIRequestFactory()
+special_view = SpecialResourceView.as_view(authentication_classes=[ClaimsJWTAuthentication])
+
+
+def get_special(token):
+    return special_view(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+
+def test_roles_compile_to_bitmasks():
+    table = RoleTable(["a.read", "a.write", "b.read"], {"reader": ["a.read", "b.read"], "writer": ["a.write"]})
+    assert table.role_mask("reader") == 0b101
+    assert table.role_mask("writer") == 0b010
+    assert table.role_mask("unknown") == 0
+    assert table.required_mask(("a.read", "b.read")) == 0b101
+
+    with pytest.raises(ImproperlyConfigured):
+        RoleTable(["a.read"], {"reader": ["a.write"]})
+
+
+@pytest.mark.django_db
+def test_token_carries_role_permissions(settings, django_assert_num_queries):
+    settings.AUTH_PERMISSIONS = ["special_resource.read", "reports.read"]
+    settings.AUTH_ROLES = {"auditor": ["reports.read", "special_resource.read"], "user": []}
+    auditor = CustomUser.objects.create(username="auditor", email=fake.email(), role="auditor")
+    user = CustomUser.objects.create(username="user", email=fake.email())
+
+    token = RefreshToken.for_user(auditor).access_token
+    assert token["perms"] == 0b11
+    assert token["rv"] == get_role_table().digest
+
+    with django_assert_num_queries(0):
+        assert get_special(token).status_code == status.HTTP_200_OK
+        assert get_special(RefreshToken.for_user(user).access_token).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_changed_role_table_overrides_token_mask(settings):
+    editor = CustomUser.objects.create(username="editor", email=fake.email(), role="editor")
+    token = RefreshToken.for_user(editor).access_token
+    assert get_special(token).status_code == status.HTTP_200_OK
+
+    settings.AUTH_ROLES = {"editor": [], "user": []}
+    assert token["rv"] != get_role_table().digest
+    assert get_special(token).status_code == status.HTTP_403_FORBIDDEN
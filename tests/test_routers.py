@@ -0,0 +1,84 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+
+from auth_app import routers
+from auth_app.tokens import RefreshToken
+
+CustomUser = get_user_model()
+fake = Faker()
+DATABASES = ["default", "replica"]
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.DATABASE_ROUTERS = ["auth_app.routers.ReplicaRouter"]
+    settings.MIDDLEWARE = ["auth_app.middleware.ReplicaPinMiddleware", *settings.MIDDLEWARE]
+    with routers.request_scope():
+        yield
+
+
+def replicate(user):
+    # Stand-in for replication; explicit `using` bypasses the router.
+    CustomUser.objects.using("replica").bulk_create([user])
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_reads_go_to_replica_until_a_write(replica):
+    user = CustomUser(username="testuser", email=fake.email())
+    user.save(using="default")
+
+    assert not routers.is_pinned()
+    assert not CustomUser.objects.filter(username="testuser").exists()
+
+    CustomUser.objects.create(username="otheruser", email=fake.email())
+    assert routers.is_pinned()
+    assert CustomUser.objects.filter(username="testuser").exists()
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_authenticated_reads_use_replica(replica):
+    user = CustomUser(username="testuser", email="primary@example.com")
+    user.save(using="default")
+    replicate(CustomUser(pk=user.pk, username="testuser", email="replica@example.com"))
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    response = client.get(f'/profile/{user.pk}/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["email"] == "replica@example.com"
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_client_reads_its_writes_in_the_next_request(replica, fast_hashing):
+    client = APIClient()
+    data = {"username": "newuser", "email": "newuser@example.com", "password": "securepassword123"}
+    response = client.post('/auth/register/', data)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.cookies[routers.PIN_COOKIE]["max-age"] == 5
+
+    assert CustomUser.objects.using("default").filter(username="newuser").exists()
+    assert not CustomUser.objects.using("replica").filter(username="newuser").exists()
+    # The request's own pin ended with it.
+    assert not routers.is_pinned()
+
+    # The replica lags behind, but the cookie keeps this client on the primary.
+    credentials = {"username": "newuser", "password": "securepassword123"}
+    assert client.post('/auth/login/', credentials).status_code == status.HTTP_200_OK
+    assert APIClient().post('/auth/login/', credentials).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_reads_do_not_set_the_pin(replica):
+    user = CustomUser(username="testuser", email=fake.email())
+    user.save(using="default")
+    replicate(CustomUser(pk=user.pk, username="testuser", email=user.email))
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    response = client.get(f'/profile/{user.pk}/')
+    assert response.status_code == status.HTTP_200_OK
+    assert routers.PIN_COOKIE not in response.cookies
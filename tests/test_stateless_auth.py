@@ -0,0 +1,100 @@
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from django.contrib.auth import get_user_model
+
+from auth_app.authentication import ClaimsJWTAuthentication, ClaimsUser
+from auth_app.tokens import AccessToken, RefreshToken
+from auth_app.views import ChangePasswordView, CheckLoginView, SpecialResourceView
+
+CustomUser = get_user_model()
+fake = Faker()
+factory = APIRequestFactory()
+
+
+def authenticate(token):
+    request = factory.get('/auth/check/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    return ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_login_token_carries_user_claims():
+    CustomUser.objects.create_user(username="editor", password="securepassword123", email=fake.email(), role="editor")
+
+    client = APIClient()
+    response = client.post('/auth/login/', {"username": "editor", "password": "securepassword123"})
+    assert response.status_code == status.HTTP_200_OK
+
+    access = AccessToken(response.data["access"])
+    assert access["role"] == "editor"
+    assert access["is_superuser"] is False
+    assert access["is_active"] is True
+
+
+@pytest.mark.django_db
+def test_claims_user_is_built_without_queries(django_assert_num_queries):
+    user = CustomUser.objects.create(username="editor", email=fake.email(), role="editor", is_superuser=True)
+    token = RefreshToken.for_user(user).access_token
+
+    with django_assert_num_queries(0):
+        claims_user, _ = authenticate(token)
+
+    assert isinstance(claims_user, ClaimsUser)
+    assert claims_user.id == user.id
+    assert claims_user.role == "editor"
+    assert claims_user.is_superuser is True
+    assert claims_user.is_authenticated
+
+
+@pytest.mark.django_db
+def test_claims_user_loads_row_lazily(django_assert_num_queries):
+    user = CustomUser.objects.create_user(username="testuser", password="securepassword123", email=fake.email())
+    claims_user, _ = authenticate(RefreshToken.for_user(user).access_token)
+
+    with django_assert_num_queries(1):
+        assert claims_user.check_password("securepassword123")
+        assert claims_user.username == "testuser"
+
+
+@pytest.mark.django_db
+def test_inactive_claim_is_rejected():
+    user = CustomUser.objects.create(username="testuser", email=fake.email(), is_active=False)
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(RefreshToken.for_user(user).access_token)
+
+
+@pytest.mark.django_db
+def test_permissions_work_with_claims_user(django_assert_num_queries):
+    editor = CustomUser.objects.create(username="editor", email=fake.email(), role="editor")
+    normal_user = CustomUser.objects.create(username="normaluser", email=fake.email())
+
+    check_view = CheckLoginView.as_view(authentication_classes=[ClaimsJWTAuthentication])
+    special_view = SpecialResourceView.as_view(authentication_classes=[ClaimsJWTAuthentication])
+
+    def get(view, user):
+        token = RefreshToken.for_user(user).access_token
+        return view(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+    with django_assert_num_queries(0):
+        assert get(check_view, normal_user).status_code == status.HTTP_200_OK
+        assert get(special_view, editor).status_code == status.HTTP_200_OK
+        assert get(special_view, normal_user).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_change_password_with_claims_user():
+    user = CustomUser.objects.create_user(username="testuser", password="oldpassword123", email=fake.email())
+    view = ChangePasswordView.as_view(authentication_classes=[ClaimsJWTAuthentication])
+    token = RefreshToken.for_user(user).access_token
+
+    request = factory.post(
+        '/auth/change-password/',
+        {"old_password": "oldpassword123", "new_password": "newpassword123"},
+        HTTP_AUTHORIZATION=f'Bearer {token}',
+    )
+    assert view(request).status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert user.check_password("newpassword123")
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+
+from auth_app import async_views
+from auth_app.hashing import hash_pool
+from auth_app.throttling import CacheWindowStore, LocalWindowStore
+
+User = get_user_model()
+
+
+# Keep a burst of logins well inside one throttle window.
+pytestmark = pytest.mark.usefixtures("fast_hashing")
+
+
+@pytest.mark.django_db
+def test_login_is_throttled_per_username(django_assert_num_queries):
+    User.objects.create_user(username="testuser", password="securepassword123")
+    client = APIClient()
+    data = {"username": "testuser", "password": "wrongpassword123"}
+
+    for _ in range(10):
+        assert client.post('/auth/login/', data).status_code == status.HTTP_401_UNAUTHORIZED
+
+    hashes = hash_pool.stats()["completed"]
+    with django_assert_num_queries(0):
+        response = client.post('/auth/login/', {"username": "TestUser ", "password": "wrongpassword123"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response
+    assert hash_pool.stats()["completed"] == hashes
+
+    # Other accounts are still reachable from the same client.
+    other = client.post('/auth/login/', {"username": "otheruser", "password": "wrongpassword123"})
+    assert other.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_register_is_throttled_per_ip():
+    client = APIClient()
+    for i in range(20):
+        data = {"username": f"user{i}", "email": f"user{i}@example.com", "password": "short"}
+        assert client.post('/auth/register/', data).status_code == status.HTTP_400_BAD_REQUEST
+
+    data = {"username": "newuser", "email": "newuser@example.com", "password": "securepassword123"}
+    assert client.post('/auth/register/', data).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    other_ip = APIClient(REMOTE_ADDR="10.0.0.2")
+    assert other_ip.post('/auth/register/', data).status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_forged_forwarded_for_does_not_bypass_ip_limit():
+    client = APIClient()
+    statuses = [
+        client.post(
+            '/auth/register/', {"username": f"user{i}", "email": f"user{i}@example.com", "password": "short"},
+            HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+        ).status_code
+        for i in range(21)
+    ]
+    assert statuses[:20] == [status.HTTP_400_BAD_REQUEST] * 20
+    assert statuses[20] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+def test_forwarded_for_is_read_behind_trusted_proxies(settings):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+    client = APIClient()
+    # Only the entry appended by our proxy counts, not what the client sent.
+    statuses = [
+        client.post(
+            '/auth/register/', {"username": f"user{i}", "email": f"user{i}@example.com", "password": "short"},
+            HTTP_X_FORWARDED_FOR=f"203.0.113.{i}, 198.51.100.7",
+        ).status_code
+        for i in range(21)
+    ]
+    assert statuses[20] == status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = client.post(
+        '/auth/register/', {"username": "other", "email": "other@example.com", "password": "short"},
+        HTTP_X_FORWARDED_FOR="198.51.100.8",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_async_login_is_throttled():
+    factory = AsyncRequestFactory()
+    body = json.dumps({"username": "testuser", "password": "wrongpassword123"})
+
+    statuses = [
+        async_to_sync(async_views.login)(factory.post('/', body, content_type='application/json')).status_code
+        for _ in range(11)
+    ]
+    assert statuses[:10] == [status.HTTP_401_UNAUTHORIZED] * 10
+    assert statuses[10] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_sliding_window_weights_previous_window():
+    store = LocalWindowStore(max_keys=10)
+    for _ in range(10):
+        assert store.hit("key", limit=10, duration=60, now=0)[0]
+    assert store.hit("key", limit=10, duration=60, now=59) == (False, 1)
+
+    # 6s into the next window 90% of the previous count still applies: 9 + 0.
+    assert store.hit("key", limit=10, duration=60, now=66)[0]
+    assert store.hit("key", limit=10, duration=60, now=67)[0]
+    # 10 * 52/60 + 2 > 10, and it takes until t=72 to slide below the limit.
+    allowed, wait = store.hit("key", limit=10, duration=60, now=68)
+    assert not allowed
+    assert wait == pytest.approx(4)
+    # Two windows later everything has slid out.
+    assert store.hit("key", limit=1, duration=60, now=200)[0]
+
+
+def test_local_store_is_bounded():
+    store = LocalWindowStore(max_keys=100)
+    for i in range(1000):
+        store.hit(f"key{i}", limit=5, duration=60, now=0)
+    assert len(store._counters) == 100
+
+
+def test_cache_store_is_shared():
+    worker_a, worker_b = CacheWindowStore("default"), CacheWindowStore("default")
+    assert worker_a.hit("shared", limit=2, duration=60, now=0)[0]
+    assert worker_b.hit("shared", limit=2, duration=60, now=1)[0]
+    assert not worker_a.hit("shared", limit=2, duration=60, now=2)[0]
@@ -3,6 +3,8 @@ from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 
+from auth_app.tokens import AccessToken, RefreshToken
+
 User = get_user_model()
 
 
@@ -37,3 +39,20 @@ def test_refresh_token_invalid():
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert "detail" in response.data
     assert response.data["detail"] == "Token is invalid or expired"
+
+
+@pytest.mark.django_db
+def test_refresh_takes_claims_from_the_user_row():
+    client = APIClient()
+    user = User.objects.create_user(username="admin", password="securepassword123", is_superuser=True, role="admin")
+    refresh_token = client.post('/auth/login/', {"username": "admin", "password": "securepassword123"}).data["refresh"]
+
+    # Zmiana z pominięciem sygnałów; odświeżenie i tak czyta aktualny wiersz.
+    User.objects.filter(pk=user.pk).update(is_superuser=False, role="user")
+    for _ in range(2):
+        response = client.post('/auth/refresh/', {"refresh": refresh_token})
+        assert response.status_code == status.HTTP_200_OK
+        refresh_token = response.data["refresh"]
+        for token in (AccessToken(response.data["access"]), RefreshToken(refresh_token)):
+            assert token["is_superuser"] is False
+            assert token["role"] == "user"
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+
+from auth_app import async_views
+from auth_app.authentication import ClaimsJWTAuthentication
+from auth_app.tokens import AccessToken, RefreshToken, introspect
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+def client_for(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db
+def test_logout_all_revokes_every_token():
+    user = CustomUser.objects.create_user(username="testuser", password="securepassword123", email=fake.email())
+    sessions = [RefreshToken.for_user(user) for _ in range(3)]
+    assert AccessToken(str(sessions[0].access_token))["ver"] == 0
+
+    response = client_for(sessions[0].access_token).post('/auth/logout-all/')
+    assert response.status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert user.token_version == 1
+
+    for refresh in sessions:
+        response = client_for(refresh.access_token).get('/auth/check/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["code"] == "token_revoked"
+        response = APIClient().post('/auth/refresh/', {"refresh": str(refresh)})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert introspect([str(sessions[0].access_token)]) == [{"active": False}]
+
+    response = APIClient().post('/auth/login/', {"username": "testuser", "password": "securepassword123"})
+    assert AccessToken(response.data["access"])["ver"] == 1
+    assert client_for(response.data["access"]).get('/auth/check/').status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_stateless_auth_checks_version_from_memory(django_assert_num_queries):
+    user = CustomUser.objects.create(username="testuser", email=fake.email())
+    token = RefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get('/auth/check/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    with django_assert_num_queries(0):
+        ClaimsJWTAuthentication().authenticate(request)
+
+    client_for(token).post('/auth/logout-all/')
+    with django_assert_num_queries(0), pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_change_password_logs_out_other_sessions():
+    user = CustomUser.objects.create_user(username="testuser", password="oldpassword123", email=fake.email())
+    other_session = RefreshToken.for_user(user)
+
+    response = client_for(RefreshToken.for_user(user).access_token).post(
+        '/auth/change-password/', {"old_password": "oldpassword123", "new_password": "newpassword123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert client_for(response.data["access"]).get('/auth/check/').status_code == status.HTTP_200_OK
+    assert client_for(other_session.access_token).get('/auth/check/').status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_async_views_reject_revoked_tokens():
+    user = CustomUser.objects.create_user(username="testuser", password="securepassword123", email=fake.email())
+    refresh = RefreshToken.for_user(user)
+    client_for(refresh.access_token).post('/auth/logout-all/')
+
+    factory = AsyncRequestFactory()
+    request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    assert async_to_sync(async_views.check_login)(request).status_code == status.HTTP_401_UNAUTHORIZED
+
+    request = factory.post('/', json.dumps({"refresh": str(refresh)}), content_type='application/json')
+    response = async_to_sync(async_views.refresh)(request)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert json.loads(response.content)["detail"] == "Token has been revoked"
+
+
+@pytest.mark.django_db
+def test_role_change_revokes_tokens():
+    editor = CustomUser.objects.create(username="editor", email=fake.email(), role="editor")
+    refresh = RefreshToken.for_user(editor)
+    request = APIRequestFactory().get('/special-resource/', HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    assert ClaimsJWTAuthentication().authenticate(request)[0].role == "editor"
+
+    # Saves that leave the claims alone keep the tokens.
+    editor.email = fake.email()
+    editor.save()
+    assert editor.token_version == 0
+
+    editor.role = "user"
+    editor.save()
+    assert editor.token_version == 1
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().authenticate(request)
+    response = APIClient().post('/auth/refresh/', {"refresh": str(refresh)})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    editor.refresh_from_db()
+    editor.is_active = False
+    editor.save(update_fields=["is_active"])
+    editor.refresh_from_db()
+    assert editor.token_version == 2
+
+
+@pytest.mark.django_db
+def test_admin_form_leaves_token_version_alone(admin_client):
+    user = CustomUser.objects.create(username="testuser", email=fake.email())
+    response = admin_client.get(f'/admin/auth_app/customuser/{user.pk}/change/')
+    assert response.status_code == status.HTTP_200_OK
+    assert "token_version" not in response.context["adminform"].form.fields
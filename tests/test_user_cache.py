@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from faker import Faker
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+
+from auth_app.cache import UserCache, user_cache
+
+CustomUser = get_user_model()
+fake = Faker()
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+@pytest.mark.django_db
+def test_repeat_requests_skip_user_lookup(django_assert_num_queries):
+    user = CustomUser.objects.create_user(username="testuser", password="securepassword123", email=fake.email())
+    client = client_for(user)
+    before = user_cache.stats()
+
+    with django_assert_num_queries(1):
+        assert client.get('/auth/check/').status_code == status.HTTP_200_OK
+    with django_assert_num_queries(0):
+        assert client.get('/auth/check/').status_code == status.HTTP_200_OK
+
+    stats = user_cache.stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_change_password_invalidates_cached_user():
+    user = CustomUser.objects.create_user(username="testuser", password="oldpassword123", email=fake.email())
+    client = client_for(user)
+    client.get('/auth/check/')
+
+    response = client.post('/auth/change-password/', {"old_password": "oldpassword123", "new_password": "newpassword123"})
+    assert response.status_code == status.HTTP_200_OK
+    assert user_cache.get(user.pk) is None
+    assert user_cache.get_user(user.pk).check_password("newpassword123")
+
+
+@pytest.mark.django_db
+def test_profile_update_and_delete_invalidate_cached_user():
+    user = CustomUser.objects.create(username="testuser", email=fake.email())
+    user_cache.get_user(user.pk)
+
+    user.role = "editor"
+    user.save()
+    assert user_cache.get_user(user.pk).role == "editor"
+
+    user.delete()
+    assert user_cache.get(user.pk) is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = UserCache(maxsize=2, ttl=60)
+    cache.set(1, "first")
+    cache.set(2, "second")
+    cache.get(1)
+    cache.set(3, "third")
+
+    assert cache.get(2) is None  # least recently used
+    assert cache.get(1) == "first"
+    assert cache.get(3) == "third"
+
+    cache.ttl = 0
+    cache.set(4, "fourth")
+    time.sleep(0.001)
+    assert cache.get(4) is None
+
+
+def test_invalidation_during_load_is_not_overwritten():
+    cache = UserCache(maxsize=10, ttl=60)
+    generation = cache._invalidations
+    cache.invalidate(1)
+    cache.set(1, "stale", generation)
+    assert cache.get(1) is None
@@ -15,9 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from django.apps import apps
+from django.conf import settings
 from django.urls import path, include
-from auth_app.views import ProfileView, SpecialResourceView
+from auth_app.views import ProfileView, SpecialResourceView, metrics_view
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
@@ -25,7 +26,15 @@ router.register('profile', ProfileView)
 
 urlpatterns = [
     path("", include(router.urls)),
-    path("admin/", admin.site.urls),
     path('auth/', include('auth_app.urls')),
     path('special-resource/', SpecialResourceView.as_view())# Auth endpoints
 ]
+
+# Not installed in the API-only mode (AUTH_API_ONLY).
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+
+if settings.AUTH_METRICS:
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))